@@ -2,4 +2,10 @@
 
 __version__ = "0.12.0"
 
-from rio_stac.stac import create_stac_item  # noqa
+from rio_stac.batch import create_stac_items  # noqa
+from rio_stac.stac import (  # noqa
+    create_stac_item,
+    create_stac_item_dict,
+    create_stac_item_from_assets,
+)
+from rio_stac.statistics import StatisticsAccumulator  # noqa
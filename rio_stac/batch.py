@@ -0,0 +1,244 @@
+"""Create STAC Items from many raster datasets."""
+
+import asyncio
+import os
+import warnings
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+import pystac
+import rasterio
+
+from rio_stac.stac import create_stac_item, create_stac_item_dict
+
+EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor,
+}
+
+
+def _create_item(
+    source: str, gdal_config: Dict, options: Dict, as_dict: bool = False
+) -> Union[pystac.Item, Dict]:
+    """Create one Item within its own GDAL environment."""
+    # GDAL configuration is not shared with the workers (process or thread)
+    with rasterio.Env(**gdal_config):
+        if as_dict:
+            return create_stac_item_dict(source, **options)
+
+        return create_stac_item(source, **options)
+
+
+def _get_result(
+    source: str,
+    future: Union[Future, asyncio.Future],
+    on_error: Optional[Callable[[str, BaseException], Any]] = None,
+) -> Optional[Union[pystac.Item, Dict]]:
+    """Get the Item from a future or report the error."""
+    exc = future.exception()
+    if exc is None:
+        return future.result()
+
+    if on_error is not None:
+        on_error(source, exc)
+    else:
+        warnings.warn(f"Could not create STAC Item for {source}: {exc}", UserWarning)
+
+    return None
+
+
+def create_stac_items(
+    sources: Iterable[str],
+    max_workers: Optional[int] = None,
+    executor: str = "process",
+    ordered: bool = False,
+    on_error: Optional[Callable[[str, BaseException], Any]] = None,
+    gdal_config: Optional[Dict] = None,
+    as_dict: bool = False,
+    **kwargs: Any,
+) -> Iterator[Union[pystac.Item, Dict]]:
+    """Create STAC Items for many datasets in parallel.
+
+    Args:
+        sources (iterable of str): input paths or URLs.
+        max_workers (int, optional): number of workers (default to the number of CPUs).
+        executor (str): `process` or `thread` pool executor (default to `process`).
+        ordered (bool): yield the items in the same order as the sources (default to False).
+        on_error (callable, optional): function called with the source and the exception when an item cannot be created. By default a warning is emitted.
+        gdal_config (dict, optional): GDAL configuration options set in each worker.
+        as_dict (bool): yield STAC Item dictionaries instead of `pystac.Item` (see `rio_stac.stac.create_stac_item_dict`). Defaults to False.
+        kwargs (optional): options forwarded to `rio_stac.create_stac_item`.
+
+    Yields:
+        pystac.Item or dict: valid STAC Item, as soon as they are created (or in order if `ordered=True`).
+
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"Invalid executor '{executor}', must be one of {list(EXECUTORS)}"
+        )
+
+    max_workers = max_workers or os.cpu_count() or 1
+    func = partial(
+        _create_item, gdal_config=gdal_config or {}, options=kwargs, as_dict=as_dict
+    )
+
+    # Only keep a limited number of tasks in flight so we don't
+    # consume the whole `sources` iterable at once.
+    sources = iter(sources)
+    window = max_workers * 2
+
+    pool: Executor = EXECUTORS[executor](max_workers=max_workers)
+    try:
+        if ordered:
+            queue = deque(
+                (src, pool.submit(func, src)) for src in islice(sources, window)
+            )
+            while queue:
+                src, future = queue.popleft()
+                for next_src in islice(sources, 1):
+                    queue.append((next_src, pool.submit(func, next_src)))
+
+                if (item := _get_result(src, future, on_error)) is not None:
+                    yield item
+
+        else:
+            pending = {pool.submit(func, src): src for src in islice(sources, window)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    src = pending.pop(future)
+                    if (item := _get_result(src, future, on_error)) is not None:
+                        yield item
+
+                for next_src in islice(sources, len(done)):
+                    pending[pool.submit(func, next_src)] = next_src
+
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def create_stac_item_async(
+    source: str,
+    executor: Optional[Executor] = None,
+    gdal_config: Optional[Dict] = None,
+    as_dict: bool = False,
+    **kwargs: Any,
+) -> Union[pystac.Item, Dict]:
+    """Create a STAC Item without blocking the event loop.
+
+    The (blocking) rasterio/GDAL calls are run in an executor within their own GDAL environment.
+
+    Args:
+        source (str): input path or URL.
+        executor (concurrent.futures.Executor, optional): executor to run the item creation with (default to the event loop's default executor).
+        gdal_config (dict, optional): GDAL configuration options.
+        as_dict (bool): return a STAC Item dictionary instead of a `pystac.Item`. Defaults to False.
+        kwargs (optional): options forwarded to `rio_stac.create_stac_item`.
+
+    Returns:
+        pystac.Item or dict: valid STAC Item.
+
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        partial(
+            _create_item,
+            source,
+            gdal_config=gdal_config or {},
+            options=kwargs,
+            as_dict=as_dict,
+        ),
+    )
+
+
+async def create_stac_items_async(
+    sources: Iterable[str],
+    max_concurrency: int = 32,
+    ordered: bool = False,
+    on_error: Optional[Callable[[str, BaseException], Any]] = None,
+    executor: Optional[Executor] = None,
+    gdal_config: Optional[Dict] = None,
+    as_dict: bool = False,
+    **kwargs: Any,
+) -> AsyncIterator[Union[pystac.Item, Dict]]:
+    """Create STAC Items for many datasets without blocking the event loop.
+
+    Args:
+        sources (iterable of str): input paths or URLs.
+        max_concurrency (int): maximum number of items created at the same time (default to 32).
+        ordered (bool): yield the items in the same order as the sources (default to False).
+        on_error (callable, optional): function called with the source and the exception when an item cannot be created. By default a warning is emitted.
+        executor (concurrent.futures.Executor, optional): executor to run the item creation with. By default a thread pool of `max_concurrency` workers is created (and shut down) for the batch.
+        gdal_config (dict, optional): GDAL configuration options set for each item.
+        as_dict (bool): yield STAC Item dictionaries instead of `pystac.Item`. Defaults to False.
+        kwargs (optional): options forwarded to `rio_stac.create_stac_item`.
+
+    Yields:
+        pystac.Item or dict: valid STAC Item, as soon as they are created (or in order if `ordered=True`).
+
+    """
+    loop = asyncio.get_running_loop()
+
+    pool = executor or ThreadPoolExecutor(max_workers=max_concurrency)
+    func = partial(
+        _create_item, gdal_config=gdal_config or {}, options=kwargs, as_dict=as_dict
+    )
+
+    def submit(src: str) -> asyncio.Future:
+        return loop.run_in_executor(pool, func, src)
+
+    sources = iter(sources)
+    queue: deque = deque()
+    pending: Dict[asyncio.Future, str] = {}
+    try:
+        if ordered:
+            queue.extend((src, submit(src)) for src in islice(sources, max_concurrency))
+            while queue:
+                src, future = queue[0]
+                await asyncio.wait([future])
+                queue.popleft()
+                for next_src in islice(sources, 1):
+                    queue.append((next_src, submit(next_src)))
+
+                if (item := _get_result(src, future, on_error)) is not None:
+                    yield item
+
+        else:
+            pending = {submit(src): src for src in islice(sources, max_concurrency)}
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    src = pending.pop(future)
+                    if (item := _get_result(src, future, on_error)) is not None:
+                        yield item
+
+                for next_src in islice(sources, len(done)):
+                    pending[submit(next_src)] = next_src
+
+    finally:
+        for future in [*pending, *(future for _, future in queue)]:
+            future.cancel()
+
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,206 @@
+"""Persistent cache for datasets metadata."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+
+def get_source_version(source: str, timeout: float = 10) -> Optional[str]:
+    """Get a version identifier (size + modification time or ETag) for a dataset.
+
+    Local files use `os.stat`, HTTP(S) URLs (and `/vsicurl/` paths) use a `HEAD` request.
+    Returns None when the version cannot be determined (the dataset won't be cached), e.g.
+    for object storage hrefs (`s3://`, `/vsis3/`, `/vsigs/`, `/vsiaz/`, ...) or other GDAL
+    virtual file systems.
+
+    """
+    if source.startswith("/vsicurl/"):
+        source = source[len("/vsicurl/") :]
+
+    if source.startswith("/vsi"):
+        return None
+
+    parsed = urlparse(source)
+    if parsed.scheme in ["http", "https"]:
+        try:
+            request = urllib.request.Request(source, method="HEAD")
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                headers = response.headers
+        except OSError:
+            return None
+
+        etag = headers.get("ETag")
+        modified = headers.get("Last-Modified")
+        if not etag and not modified:
+            return None
+
+        return f"{headers.get('Content-Length')}:{etag or modified}"
+
+    if parsed.scheme not in ["", "file"]:
+        return None
+
+    path = parsed.path if parsed.scheme == "file" else source
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class MetadataCache:
+    """SQLite cache for the metadata computed from datasets.
+
+    Entries are keyed by the dataset href, its version (size + modification time or ETag)
+    and the options used to compute the metadata. Only local files and HTTP(S) datasets
+    are cached (see `get_source_version`). When the cache holds more than `max_entries`,
+    the least recently used entries are evicted.
+
+    The cache can be shared between threads and processes (it will be re-opened in each process).
+    The hits and misses are counted in the database, so the counts include the lookups made by
+    all the copies of the cache (e.g in the workers of a process pool).
+
+    Attributes:
+        path (str): SQLite database path.
+        max_entries (int): maximum number of entries.
+        hits (int): number of cache hits.
+        misses (int): number of cache misses.
+
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        """Open or create the cache database."""
+        self.path = path
+        self.max_entries = max_entries
+        # Counters are stored for this instance (and its copies) only
+        self._uid = uuid.uuid4().hex
+        self._owner = True
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        """Connect to the database and create the table."""
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT, accessed REAL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS metadata_accessed ON metadata (accessed)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS counters (uid TEXT, name TEXT, value INTEGER, PRIMARY KEY (uid, name))"
+            )
+
+    def __getstate__(self) -> Dict:
+        """Do not pickle the database connection."""
+        return {
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "_uid": self._uid,
+        }
+
+    def __setstate__(self, state: Dict):
+        """Re-open the database connection."""
+        self.__dict__.update(state)
+        self._owner = False
+        self._lock = threading.Lock()
+        self._connect()
+
+    def __enter__(self):
+        """Support using with Context Managers."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Support using with Context Managers."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of entries in the cache."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+    def _get_counter(self, name: str) -> int:
+        """Get a counter value."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM counters WHERE uid = ? AND name = ?", (self._uid, name)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _increment(self, name: str):
+        """Increment a counter (within the current transaction)."""
+        self._db.execute(
+            "INSERT INTO counters (uid, name, value) VALUES (?, ?, 1) "
+            "ON CONFLICT (uid, name) DO UPDATE SET value = value + 1",
+            (self._uid, name),
+        )
+
+    @property
+    def hits(self) -> int:
+        """Number of cache hits."""
+        return self._get_counter("hits")
+
+    @property
+    def misses(self) -> int:
+        """Number of cache misses."""
+        return self._get_counter("misses")
+
+    def close(self):
+        """Close the database connection (and remove the counters of this instance)."""
+        if self._owner:
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM counters WHERE uid = ?", (self._uid,))
+        self._db.close()
+
+    def get_key(self, source: str, options: Dict[str, Any]) -> Optional[str]:
+        """Create a cache key from the dataset href, version and options.
+
+        Returns None if the dataset version cannot be determined.
+
+        """
+        version = get_source_version(source)
+        if version is None:
+            return None
+
+        opts = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{source}|{version}|{opts}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get metadata from the cache."""
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT value FROM metadata WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._increment("misses")
+                return None
+
+            self._db.execute(
+                "UPDATE metadata SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            self._increment("hits")
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict):
+        """Add metadata to the cache and evict the least recently used entries."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO metadata (key, value, accessed) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            count = self._db.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+            if count > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM metadata WHERE key IN (SELECT key FROM metadata ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                )
@@ -0,0 +1,238 @@
+"""Create STAC Collection from STAC Items."""
+
+import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TypeVar, Union
+
+import pystac
+from pystac.utils import str_to_datetime
+
+from rio_stac.stac import _merge_bbox
+from rio_stac.statistics import StatisticsAccumulator
+
+T = TypeVar("T", pystac.Item, Dict)
+
+
+def _merge_range(current: Optional[List], minimum, maximum) -> List:
+    """Merge a [minimum, maximum] range."""
+    if current is None:
+        return [minimum, maximum]
+
+    return [min(current[0], minimum), max(current[1], maximum)]
+
+
+class CollectionAggregator:
+    """Merge the extents and summaries of STAC Items, one item at a time.
+
+    Only the merged values are kept in memory (bbox, datetime range, EPSG codes,
+    cloud cover range and, for each band index, the data types and statistics)
+    so the aggregator can be fed with any number of items.
+
+    Band statistics are merged with `rio_stac.statistics.StatisticsAccumulator`: the minimum
+    and maximum from all the items, and the mean, standard deviation and valid percent
+    weighted by the number of pixels of the items with a `proj:shape`.
+
+    Attributes:
+        count (int): number of items.
+        bbox (list): union of the items bbox (crossing the antimeridian if `minx > maxx`).
+        start_datetime (datetime.datetime): earliest item datetime.
+        end_datetime (datetime.datetime): latest item datetime.
+
+    """
+
+    def __init__(self):
+        """Create an empty aggregator."""
+        self.count = 0
+        self.bbox: Optional[List[float]] = None
+        self.start_datetime: Optional[datetime.datetime] = None
+        self.end_datetime: Optional[datetime.datetime] = None
+        self.extensions: Set[str] = set()
+        self.epsg: Set[int] = set()
+        self.cloud_cover: Optional[List[float]] = None
+        self.bands: List[Dict] = []
+
+    def _merge_bbox(self, bbox: List[float]):
+        """Merge a 2D bbox (crossing the antimeridian if `minx > maxx`)."""
+        self.bbox = _merge_bbox([self.bbox, bbox]) if self.bbox else list(bbox)
+
+    def _merge_datetime(self, start: datetime.datetime, end: datetime.datetime):
+        """Merge the datetime range."""
+        if self.start_datetime is None or start < self.start_datetime:
+            self.start_datetime = start
+
+        if self.end_datetime is None or end > self.end_datetime:
+            self.end_datetime = end
+
+    def _merge_band(
+        self,
+        idx: int,
+        data_types: Set[str],
+        statistics: Optional[List],
+        accumulator: Optional[StatisticsAccumulator] = None,
+    ):
+        """Merge the data types and statistics of a band."""
+        while len(self.bands) <= idx:
+            self.bands.append(
+                {
+                    "data_types": set(),
+                    "statistics": None,
+                    "accumulator": StatisticsAccumulator(),
+                }
+            )
+
+        band = self.bands[idx]
+        band["data_types"] |= data_types
+        if statistics is not None:
+            band["statistics"] = _merge_range(band["statistics"], *statistics)
+
+        if accumulator is not None:
+            band["accumulator"].merge(accumulator)
+
+    def add(self, item: Union[pystac.Item, Dict]) -> None:
+        """Add an item (pystac.Item or dictionary)."""
+        if isinstance(item, pystac.Item):
+            item = item.to_dict(include_self_link=False, transform_hrefs=False)
+
+        self.count += 1
+        self.extensions.update(item.get("stac_extensions") or [])
+
+        if bbox := item.get("bbox"):
+            # Only use the 2D bbox
+            self._merge_bbox(
+                bbox if len(bbox) == 4 else [bbox[0], bbox[1], bbox[3], bbox[4]]
+            )
+
+        properties = item.get("properties", {})
+        start = properties.get("start_datetime") or properties.get("datetime")
+        end = properties.get("end_datetime") or properties.get("datetime")
+        if start and end:
+            self._merge_datetime(str_to_datetime(start), str_to_datetime(end))
+
+        if (cloud_cover := properties.get("eo:cloud_cover")) is not None:
+            self.cloud_cover = _merge_range(self.cloud_cover, cloud_cover, cloud_cover)
+
+        for fields in [properties, *item.get("assets", {}).values()]:
+            if (epsg := fields.get("proj:epsg")) is not None:
+                self.epsg.add(epsg)
+
+            shape = fields.get("proj:shape") or properties.get("proj:shape")
+            for idx, band in enumerate(fields.get("raster:bands") or []):
+                stats = band.get("statistics") or {}
+                has_range = "minimum" in stats and "maximum" in stats
+                self._merge_band(
+                    idx,
+                    {band["data_type"]} if band.get("data_type") else set(),
+                    [stats["minimum"], stats["maximum"]] if has_range else None,
+                    StatisticsAccumulator.from_statistics(stats, shape[0] * shape[1])
+                    if shape and has_range and "mean" in stats
+                    else None,
+                )
+
+    def merge(self, other: "CollectionAggregator") -> None:
+        """Merge another aggregator (e.g. created in another process)."""
+        if other.count == 0:
+            return
+
+        self.count += other.count
+        self.extensions |= other.extensions
+        self.epsg |= other.epsg
+
+        if other.bbox is not None:
+            self._merge_bbox(other.bbox)
+
+        if other.start_datetime is not None and other.end_datetime is not None:
+            self._merge_datetime(other.start_datetime, other.end_datetime)
+
+        if other.cloud_cover is not None:
+            self.cloud_cover = _merge_range(self.cloud_cover, *other.cloud_cover)
+
+        for idx, band in enumerate(other.bands):
+            self._merge_band(
+                idx, band["data_types"], band["statistics"], band["accumulator"]
+            )
+
+    def consume(self, items: Iterable[T]) -> Iterator[T]:
+        """Add the items and yield them (e.g. to write them at the same time)."""
+        for item in items:
+            self.add(item)
+            yield item
+
+    def summaries(self) -> Dict:
+        """Get the collection summaries."""
+        summaries: Dict = {}
+        if self.epsg:
+            summaries["proj:epsg"] = sorted(self.epsg)
+
+        if self.cloud_cover is not None:
+            summaries["eo:cloud_cover"] = {
+                "minimum": self.cloud_cover[0],
+                "maximum": self.cloud_cover[1],
+            }
+
+        bands = []
+        for band in self.bands:
+            summary: Dict = {}
+            if band["data_types"]:
+                summary["data_type"] = sorted(band["data_types"])
+
+            if band["statistics"] is not None:
+                summary["statistics"] = {
+                    "minimum": band["statistics"][0],
+                    "maximum": band["statistics"][1],
+                }
+
+                accumulator = band["accumulator"]
+                if accumulator.count:
+                    statistics = accumulator.finalize()["statistics"]
+                    summary["statistics"].update(
+                        {
+                            "mean": statistics["mean"],
+                            "stddev": statistics["stddev"],
+                            "valid_percent": statistics["valid_percent"],
+                        }
+                    )
+
+            bands.append(summary)
+
+        if bands:
+            summaries["raster:bands"] = bands
+
+        return summaries
+
+    def to_collection(
+        self,
+        id: str,
+        description: Optional[str] = None,
+        title: Optional[str] = None,
+        license: str = "other",
+    ) -> pystac.Collection:
+        """Create a STAC Collection.
+
+        Args:
+            id (str): collection id.
+            description (str, optional): collection description (default to the id).
+            title (str, optional): collection title.
+            license (str): collection license (default to `other`).
+
+        Returns:
+            pystac.Collection: STAC Collection.
+
+        """
+        if not self.count:
+            raise ValueError("Cannot create a Collection without items")
+
+        extent = pystac.Extent(
+            spatial=pystac.SpatialExtent(
+                [self.bbox] if self.bbox else [[-180.0, -90.0, 180.0, 90.0]]
+            ),
+            temporal=pystac.TemporalExtent([[self.start_datetime, self.end_datetime]]),
+        )
+
+        return pystac.Collection(
+            id=id,
+            description=description or id,
+            title=title,
+            license=license,
+            extent=extent,
+            summaries=pystac.Summaries(self.summaries()),
+            stac_extensions=sorted(self.extensions),
+        )
@@ -1,14 +1,38 @@
 """rio_stac.scripts.cli."""
 
+import fnmatch
+import glob
+import itertools
 import json
+import os
+from typing import Dict, Iterator, Optional, Sequence
+from urllib.parse import urlparse
 
 import click
 import rasterio
 from pystac import MediaType
 from pystac.utils import datetime_to_str, str_to_datetime
+from rasterio.errors import RasterioIOError
 from rasterio.rio import options
 
-from rio_stac import create_stac_item
+from rio_stac import create_stac_item_dict, create_stac_items
+from rio_stac.cache import MetadataCache
+from rio_stac.collection import CollectionAggregator
+from rio_stac.serialization import dumps
+from rio_stac.session import Session
+
+# Files used when INPUT is a directory (see `--include`)
+DEFAULT_INCLUDE = (
+    "*.tif",
+    "*.tiff",
+    "*.jp2",
+    "*.vrt",
+    "*.img",
+    "*.nc",
+    "*.hdf",
+    "*.h5",
+    "*.grib2",
+)
 
 
 def _cb_key_val(ctx, param, value):
@@ -27,8 +51,113 @@ def _cb_key_val(ctx, param, value):
         return out
 
 
-@click.command()
-@options.file_in_arg
+def _is_dataset(path: str) -> bool:
+    """Check if a directory can be opened as a dataset (e.g Zarr, AIG)."""
+    try:
+        with rasterio.open(path):
+            return True
+    except RasterioIOError:
+        return False
+
+
+def _is_batch(input: str, manifest: bool) -> bool:
+    """Check if the input refers to multiple datasets.
+
+    URLs (e.g presigned URLs with `?`) and GDAL virtual file system paths are single datasets,
+    as well as directories which can be opened as a dataset (e.g Zarr).
+
+    """
+    if manifest or input == "-":
+        return True
+
+    if urlparse(input).scheme not in ["", "file"] or input.startswith("/vsi"):
+        return False
+
+    if os.path.isdir(input):
+        return not _is_dataset(input)
+
+    return glob.has_magic(input) and not os.path.exists(input)
+
+
+def _echo_timings(item: Dict) -> None:
+    """Remove the timings from the item and write them to stderr (as JSON)."""
+    timings = item["properties"].pop("rio_stac:timings", None)
+    if timings is not None:
+        click.echo(dumps({"id": item["id"], "timings": timings}), err=True)
+
+
+def _echo_cache_stats(cache: Optional[MetadataCache]) -> None:
+    """Write the cache hits and misses to stderr (as JSON)."""
+    if cache is not None:
+        click.echo(
+            dumps({"cache": {"hits": cache.hits, "misses": cache.misses}}), err=True
+        )
+
+
+def _get_sources(
+    input: str, manifest: bool, include: Sequence[str] = DEFAULT_INCLUDE
+) -> Iterator[str]:
+    """Get datasets path from a directory, a glob pattern or a list of paths.
+
+    In a directory, only the files matching one of the `include` patterns (case insensitive)
+    are used, so sidecar files (e.g `.aux.xml`, `.ovr`, `.msk`) and other files are skipped.
+
+    """
+    if manifest or input == "-":
+        with click.open_file(input, "r") as f:
+            for line in f:
+                if line := line.strip():
+                    yield line
+
+    elif os.path.isdir(input):
+        for root, _, files in sorted(os.walk(input)):
+            for name in sorted(files):
+                if any(fnmatch.fnmatch(name.lower(), p.lower()) for p in include):
+                    yield os.path.abspath(os.path.join(root, name))
+
+    else:
+        for path in sorted(glob.glob(input, recursive=True)):
+            if os.path.isfile(path):
+                yield os.path.abspath(path)
+
+
+class _DefaultGroup(click.Group):
+    """Group running the `item` command when no sub-command is given."""
+
+    def parse_args(self, ctx, args):
+        """Insert the default command name (`rio stac INPUT` == `rio stac item INPUT`).
+
+        Without arguments or with `--help`, the group help (listing the sub-commands) is shown.
+
+        """
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = ["item", *args]
+
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=_DefaultGroup)
+def stac():
+    """Rasterio STAC plugin: Create STAC Items and Collections for raster datasets.
+
+    `rio stac INPUT` is a shortcut for `rio stac item INPUT`.
+    """
+
+
+@stac.command()
+@click.argument("input", type=str)
+@click.option(
+    "--manifest",
+    is_flag=True,
+    default=False,
+    help="Treat INPUT as a text file listing one dataset per line ('-' reads from stdin).",
+)
+@click.option(
+    "--include",
+    type=str,
+    multiple=True,
+    help=f"File name pattern of the datasets to use when INPUT is a directory (default to {', '.join(DEFAULT_INCLUDE)}).",
+)
 @click.option(
     "--datetime",
     "-d",
@@ -95,6 +224,35 @@ def _cb_key_val(ctx, param, value):
     help="Limit array size from which to get the raster statistics.",
     show_default=True,
 )
+@click.option(
+    "--stats-method",
+    type=click.Choice(
+        ["decimated", "blockwise", "sample", "metadata", "gdal-approx", "gdal-exact"]
+    ),
+    default="decimated",
+    help="Method used to calculate the raster statistics ('blockwise' reads the full resolution data block by block, 'sample' reads a random sample of blocks, 'metadata' only uses statistics stored in the dataset metadata, 'gdal-*' uses GDAL statistics).",
+    show_default=True,
+)
+@click.option(
+    "--sample-size",
+    type=click.IntRange(min=1),
+    default=1024 * 1024,
+    help="Maximum number of pixels (per band) read to calculate the 'sample' statistics.",
+    show_default=True,
+)
+@click.option(
+    "--percentile",
+    type=click.FloatRange(min=0, max=100),
+    multiple=True,
+    help="Percentile to add to the raster statistics (e.g `--percentile 2 --percentile 98`).",
+)
+@click.option(
+    "--stats-threads",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of threads used to calculate the 'blockwise' statistics of each dataset.",
+    show_default=True,
+)
 @click.option(
     "--densify-geom",
     type=int,
@@ -106,6 +264,25 @@ def _cb_key_val(ctx, param, value):
     default=-1,
     help="Round geometry coordinates to this number of decimal. By default, coordinates will not be rounded",
 )
+@click.option(
+    "--geom-from-mask",
+    is_flag=True,
+    default=False,
+    help="Use the outline of the valid pixels (from the dataset mask) as geometry instead of the dataset bounds.",
+)
+@click.option(
+    "--geom-max-vertices",
+    type=click.IntRange(min=4),
+    default=256,
+    help="Maximum number of vertices of the valid pixels outline.",
+    show_default=True,
+)
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(dir_okay=False),
+    help="SQLite database used to cache the datasets metadata (unchanged datasets won't be opened). Only local files and HTTP(S) URLs are cached.",
+)
 @click.option("--output", "-o", type=click.Path(exists=False), help="Output file name")
 @click.option(
     "--config",
@@ -115,8 +292,24 @@ def _cb_key_val(ctx, param, value):
     callback=options._cb_key_val,
     help="GDAL configuration options.",
 )
-def stac(
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of parallel workers when creating multiple items.",
+    show_default=True,
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Write the time spent in each phase of the items creation (and the cache hits and misses) to stderr (as newline-delimited JSON).",
+)
+def item(
     input,
+    manifest,
+    include,
     input_datetime,
     extension,
     collection,
@@ -130,12 +323,29 @@ def stac(
     with_raster,
     with_eo,
     max_raster_size,
+    stats_method,
+    sample_size,
+    stats_threads,
+    percentile,
     densify_geom,
     geom_precision,
+    geom_from_mask,
+    geom_max_vertices,
+    cache_path,
     output,
     config,
+    jobs,
+    profile,
 ):
-    """Rasterio STAC plugin: Create a STAC Item for raster dataset."""
+    """Create STAC Items for raster datasets.
+
+    INPUT can be a dataset path, a directory, a glob pattern (e.g 'data/**/*.tif')
+    or a file listing datasets (with `--manifest`, or `-` for stdin). When
+    INPUT refers to multiple datasets, items are written as newline-delimited JSON.
+
+    `rio stac INPUT` is a shortcut for `rio stac item INPUT`, use
+    `rio stac collection` to create a STAC Collection from the items.
+    """
     property = property or {}
     densify_geom = densify_geom or 0
 
@@ -151,30 +361,136 @@ def stac(
     if asset_mediatype and asset_mediatype != "auto":
         asset_mediatype = MediaType[asset_mediatype]
 
+    if percentile and stats_method in ["metadata", "gdal-approx", "gdal-exact"]:
+        raise click.BadParameter(
+            f"percentiles are not supported by the '{stats_method}' statistics method.",
+            param_hint="'--percentile'",
+        )
+
     extensions = [e for e in extension if e]
 
-    with rasterio.Env(**config):
-        item = create_stac_item(
-            input,
-            input_datetime=input_datetime,
-            extensions=extensions,
-            collection=collection,
-            collection_url=collection_url,
-            properties=property,
-            id=id,
-            asset_name=asset_name,
-            asset_href=asset_href,
-            asset_media_type=asset_mediatype,
-            with_proj=with_proj,
-            with_raster=with_raster,
-            with_eo=with_eo,
-            raster_max_size=max_raster_size,
-            geom_densify_pts=densify_geom,
-            geom_precision=geom_precision,
+    item_options = {
+        "input_datetime": input_datetime,
+        "extensions": extensions,
+        "collection": collection,
+        "collection_url": collection_url,
+        "properties": property,
+        "asset_name": asset_name,
+        "asset_media_type": asset_mediatype,
+        "with_proj": with_proj,
+        "with_raster": with_raster,
+        "with_eo": with_eo,
+        "raster_max_size": max_raster_size,
+        "raster_stats_method": stats_method,
+        "raster_sample_size": sample_size,
+        "raster_num_threads": stats_threads,
+        "raster_percentiles": list(percentile) or None,
+        "geom_densify_pts": densify_geom,
+        "geom_precision": geom_precision,
+        "geom_from_mask": geom_from_mask,
+        "geom_max_vertices": geom_max_vertices,
+        "cache": None,
+        "timings": profile,
+    }
+
+    if cache_path:
+        cache = MetadataCache(cache_path)
+        click.get_current_context().call_on_close(cache.close)
+        item_options["cache"] = cache
+
+    if not _is_batch(input, manifest):
+        input = options.file_in_handler(None, None, input)
+
+        with rasterio.Env(**config):
+            item = create_stac_item_dict(
+                input, id=id, asset_href=asset_href, **item_options
+            )
+
+        _echo_timings(item)
+
+        if output:
+            with open(output, "w") as f:
+                f.write(dumps(item))
+        else:
+            click.echo(dumps(item))
+
+        _echo_cache_stats(item_options["cache"] if profile else None)
+
+        return
+
+    if id or asset_href:
+        raise click.UsageError(
+            "`--id` and `--asset-href` options can only be used with a single dataset."
         )
 
-    if output:
-        with open(output, "w") as f:
-            f.write(json.dumps(item.to_dict(), separators=(",", ":")))
-    else:
-        click.echo(json.dumps(item.to_dict(), separators=(",", ":")))
+    errors = []
+
+    def _on_error(src, exc):
+        errors.append(src)
+        click.echo(f"Could not create STAC Item for {src}: {exc}", err=True)
+
+    sources = _get_sources(input, manifest, include=include or DEFAULT_INCLUDE)
+    if not manifest and input != "-":
+        first = next(sources, None)
+        if first is None:
+            raise click.UsageError(f"No datasets found in {input}.")
+        sources = itertools.chain([first], sources)
+
+    items = create_stac_items(
+        sources,
+        max_workers=jobs,
+        executor="process" if jobs > 1 else "thread",
+        ordered=True,
+        on_error=_on_error,
+        as_dict=True,
+        session=Session(config=config),
+        **item_options,
+    )
+
+    with click.open_file(output or "-", "w") as f:
+        for item in items:
+            _echo_timings(item)
+            f.write(dumps(item) + "\n")
+
+    _echo_cache_stats(item_options["cache"] if profile else None)
+
+    if errors:
+        raise click.ClickException(f"Could not create {len(errors)} STAC Item(s).")
+
+
+@stac.command()
+@click.argument("input", type=click.File("r"), default="-")
+@click.option("--id", type=str, required=True, help="Collection id.")
+@click.option(
+    "--description", type=str, help="Collection description (default to the id)."
+)
+@click.option("--title", type=str, help="Collection title.")
+@click.option(
+    "--license",
+    type=str,
+    default="other",
+    help="Collection license (SPDX identifier).",
+    show_default=True,
+)
+@click.option("--output", "-o", type=click.Path(exists=False), help="Output file name")
+def collection(input, id, description, title, license, output):
+    """Create a STAC Collection from STAC Items.
+
+    INPUT is a newline-delimited JSON file of STAC Items (default to stdin), e.g. the output
+    of `rio stac 'data/*.tif'`. Items are read one at a time: the collection extent and
+    summaries are merged incrementally.
+    """
+    aggregator = CollectionAggregator()
+    for line in input:
+        if line := line.strip():
+            aggregator.add(json.loads(line))
+
+    if not aggregator.count:
+        raise click.UsageError("No STAC Items found in INPUT.")
+
+    collection = aggregator.to_collection(
+        id, description=description, title=title, license=license
+    )
+
+    with click.open_file(output or "-", "w") as f:
+        f.write(dumps(collection.to_dict(include_self_link=False)) + "\n")
@@ -0,0 +1,46 @@
+"""Fast JSON serialization of STAC Items."""
+
+import datetime
+import json
+from typing import Any, Dict
+
+import numpy
+from pystac.utils import datetime_to_str
+
+try:
+    import orjson
+except ImportError:  # pragma: nocover
+    orjson = None  # type: ignore
+
+
+def _default(obj: Any) -> Any:
+    """Convert numpy and datetime objects to JSON compatible objects."""
+    if isinstance(obj, numpy.generic):
+        return obj.item()
+
+    if isinstance(obj, numpy.ndarray):
+        return obj.tolist()
+
+    if isinstance(obj, datetime.datetime):
+        return datetime_to_str(obj)
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Dict) -> str:
+    """Serialize a STAC Item dictionary to a compact JSON string.
+
+    Use `orjson` when available (`pip install rio-stac["orjson"]`), or the standard
+    `json` module. Numpy arrays, numpy scalars and datetimes are supported.
+
+    Note: with `orjson`, NaN and Infinity are serialized as `null`.
+
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()
+
+    return json.dumps(obj, separators=(",", ":"), default=_default)
@@ -0,0 +1,186 @@
+"""Shared GDAL environment and dataset handles for creating many items."""
+
+import os
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import rasterio
+from rasterio.io import DatasetReader
+
+# GDAL configuration tuned for reading many (remote) datasets
+DEFAULT_GDAL_CONFIG = {
+    "VSI_CACHE": "TRUE",
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_VERSION": "2",
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MAX_RETRY": "3",
+    "GDAL_HTTP_RETRY_DELAY": "1",
+}
+
+
+class _Pool(OrderedDict):
+    """Opened datasets of a thread (closed when the thread exits)."""
+
+    def close(self):
+        """Close all the datasets."""
+        for dataset in self.values():
+            dataset.close()
+        self.clear()
+
+    def __del__(self):
+        """Close the datasets when the thread-local storage is released."""
+        self.close()
+
+
+# Sessions un-pickled in worker processes (shared by all the tasks of a process)
+_SESSIONS: Dict[str, "Session"] = {}
+
+
+def _get_session(uid: str, config: Dict, max_handles: int) -> "Session":
+    """Get (or create) the session instance for the current process."""
+    if uid not in _SESSIONS:
+        session = Session(config=config, max_handles=max_handles)
+        session._uid = uid
+        _SESSIONS[uid] = session
+
+    return _SESSIONS[uid]
+
+
+class Session:
+    """GDAL configuration and pool of opened datasets shared by many items.
+
+    The session holds the GDAL configuration used to open and read the datasets (tuned
+    VSI cache and HTTP settings by default, unless the options are set as environment variables)
+    and, when `max_handles` is greater than 0, keeps up to `max_handles` datasets opened in each
+    thread (least recently used datasets are closed first, and all the datasets of a thread are
+    closed when it exits).
+
+    Sessions can be used with thread and process pools: in each worker process, all the tasks share
+    the same session instance.
+
+    Note: pooled datasets are not re-opened when the files change.
+
+    Attributes:
+        config (dict): GDAL configuration options.
+        max_handles (int): maximum number of opened datasets per thread (default to 0, datasets are closed after use).
+
+    """
+
+    def __init__(self, config: Optional[Dict] = None, max_handles: int = 0):
+        """Create the session."""
+        defaults = {
+            name: value
+            for name, value in DEFAULT_GDAL_CONFIG.items()
+            if name not in os.environ
+        }
+        self.config = {**defaults, **(config or {})}
+        self.max_handles = max_handles
+        self._uid = uuid.uuid4().hex
+        self._local = threading.local()
+        self._pools: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._env: Optional[rasterio.Env] = None
+
+    def __reduce__(self):
+        """Re-use the same session for all the tasks of a worker process."""
+        return (_get_session, (self._uid, self.config, self.max_handles))
+
+    def __enter__(self):
+        """Enter the session GDAL environment."""
+        self._env = rasterio.Env(**self.config)
+        self._env.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the datasets and exit the GDAL environment."""
+        self.close()
+        if self._env is not None:
+            self._env.__exit__(exc_type, exc_value, traceback)
+            self._env = None
+
+    def __len__(self) -> int:
+        """Number of opened datasets (in all the threads)."""
+        with self._lock:
+            return sum(len(pool) for pool in self._pools.values())
+
+    @contextmanager
+    def env(self) -> Iterator[rasterio.Env]:
+        """GDAL environment with the session configuration.
+
+        The environment is created once per thread and only entered by the outermost call.
+
+        """
+        local = self._local
+        env = getattr(local, "env", None)
+        if env is None:
+            env = local.env = rasterio.Env(**self.config)
+
+        depth = getattr(local, "env_depth", 0)
+        local.env_depth = depth + 1
+        try:
+            if depth:
+                yield env
+            else:
+                with env:
+                    yield env
+        finally:
+            local.env_depth = depth
+
+    def _get_pool(self) -> _Pool:
+        """Get the opened datasets of the current thread."""
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = _Pool()
+            self._local.in_use = {}
+            with self._lock:
+                self._pools[id(pool)] = pool
+
+        return pool
+
+    def _evict(self, pool: _Pool):
+        """Close the least recently used datasets (not in use)."""
+        in_use = self._local.in_use
+        for path in list(pool):
+            if len(pool) <= self.max_handles:
+                break
+
+            if not in_use.get(path):
+                pool.pop(path).close()
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[DatasetReader]:
+        """Open a dataset (or get it from the pool).
+
+        The dataset should be used in the session GDAL environment (see `Session.env`).
+
+        """
+        if not self.max_handles:
+            with rasterio.open(path) as src_dst:
+                yield src_dst
+            return
+
+        pool = self._get_pool()
+        src_dst = pool.pop(path, None)
+        if src_dst is None or src_dst.closed:
+            src_dst = rasterio.open(path)
+
+        # most recently used datasets are at the end
+        pool[path] = src_dst
+        in_use = self._local.in_use
+        in_use[path] = in_use.get(path, 0) + 1
+        try:
+            self._evict(pool)
+            yield src_dst
+        finally:
+            in_use[path] -= 1
+            self._evict(pool)
+
+    def close(self):
+        """Close all the opened datasets."""
+        with self._lock:
+            for pool in list(self._pools.values()):
+                pool.close()
@@ -1,20 +1,38 @@
 """Create STAC Item from a rasterio dataset."""
 
+import copy
 import datetime
+import functools
 import math
 import os
+import time
 import warnings
-from contextlib import ExitStack
-from typing import Dict, List, Optional, Sequence, Tuple, Union
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy
 import pystac
 import rasterio
-from pystac.utils import str_to_datetime
+from pystac.utils import datetime_to_str, str_to_datetime
 from rasterio import transform, warp
 from rasterio.features import bounds as feature_bounds
+from rasterio.features import shapes
 from rasterio.io import DatasetReader, DatasetWriter, MemoryFile
 from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
+
+from rio_stac.cache import MetadataCache
+from rio_stac.session import Session
+from rio_stac.statistics import (
+    StatisticsAccumulator,
+    _get_percentiles,
+    _get_valid_values,
+    _get_value_counts,
+    get_sketch_edges,
+    percentile_name,
+)
 
 PROJECTION_EXT_VERSION = "v1.1.0"
 RASTER_EXT_VERSION = "v1.1.0"
@@ -23,6 +41,17 @@ EO_EXT_VERSION = "v1.1.0"
 EPSG_4326 = rasterio.crs.CRS.from_epsg(4326)
 
 
+@contextmanager
+def _timer(timings: Optional[Dict[str, float]], name: str) -> Iterator[None]:
+    """Add the duration (in seconds) of the block to `timings[name]`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
 def bbox_to_geom(bbox: Tuple[float, float, float, float]) -> Dict:
     """Return a geojson geometry from a bbox."""
     return {
@@ -39,48 +68,388 @@ def bbox_to_geom(bbox: Tuple[float, float, float, float]) -> Dict:
     }
 
 
-def get_dataset_geom(
-    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+def _merge_bbox(bboxes: Sequence[Sequence[float]]) -> List[float]:
+    """Get the union of geographic bboxes (bboxes crossing the antimeridian have `minx > maxx`).
+
+    The longitude range is the smallest one covering all the bboxes, which might cross
+    the antimeridian (`minx > maxx`).
+
+    """
+    # Longitude intervals (with copies shifted by 360 degrees) sorted and merged,
+    # keeping the input values to not introduce rounding errors
+    intervals = sorted(
+        (minx + shift, (maxx if maxx >= minx else maxx + 360) + shift, minx, maxx)
+        for minx, _, maxx, _ in bboxes
+        for shift in [-360, 0, 360]
+    )
+    merged = [list(intervals[0])]
+    for start, end, minx, maxx in intervals[1:]:
+        if start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1], merged[-1][3] = end, maxx
+        else:
+            merged.append([start, end, minx, maxx])
+
+    # Each uncovered range appears once with a start in [-180, 180)
+    gaps = [
+        (end, start, maxx, minx)
+        for (_, end, _, maxx), (start, _, minx, _) in zip(merged[:-1], merged[1:])
+        if -180 <= end < 180
+    ]
+
+    miny = min(bbox[1] for bbox in bboxes)
+    maxy = max(bbox[3] for bbox in bboxes)
+    if not gaps:
+        return [-180.0, miny, 180.0, maxy]
+
+    # The union is the complement of the largest uncovered range
+    _, _, maxx, minx = max(gaps, key=lambda gap: gap[1] - gap[0])
+    return [minx, miny, maxx, maxy]
+
+
+def _bbox_to_geom(bbox: Sequence[float]) -> Dict:
+    """Return a geojson geometry from a bbox (split at the antimeridian if `minx > maxx`)."""
+    minx, miny, maxx, maxy = bbox
+    if minx <= maxx:
+        return bbox_to_geom((minx, miny, maxx, maxy))
+
+    return {
+        "type": "MultiPolygon",
+        "coordinates": [
+            bbox_to_geom((minx, miny, 180.0, maxy))["coordinates"],
+            bbox_to_geom((-180.0, miny, maxx, maxy))["coordinates"],
+        ],
+    }
+
+
+def _densify_rings(rings: numpy.ndarray, densify_pts: int) -> numpy.ndarray:
+    """Add `densify_pts - 1` equidistant points between each vertex of closed rings.
+
+    Args:
+        rings (numpy.ndarray): closed rings of shape (N, vertices, 2).
+        densify_pts (int): number of segments between each existing vertex.
+
+    Returns:
+        numpy.ndarray: densified rings of shape (N, (vertices - 1) * densify_pts + 1, 2).
+
+    """
+    # Derived from code found at
+    # https://stackoverflow.com/questions/64995977/generating-equidistance-points-along-the-boundary-of-a-polygon-but-cw-ccw
+    start = rings[:, :-1, None, :]
+    step = (rings[:, 1:, None, :] - start) / densify_pts
+    points = start + step * numpy.arange(densify_pts)[None, None, :, None]
+    points = points.reshape(len(rings), -1, 2)
+    return numpy.concatenate([points, rings[:, -1:, :]], axis=1)
+
+
+def get_dataset_geoms(
+    bounds: Sequence[Tuple[float, float, float, float]],
+    crs: Union[Optional[rasterio.crs.CRS], Sequence[Optional[rasterio.crs.CRS]]],
     densify_pts: int = 0,
     precision: int = -1,
     geographic_crs: rasterio.crs.CRS = EPSG_4326,
-) -> Dict:
-    """Get Raster Footprint."""
+) -> List[Dict]:
+    """Get Footprints for many datasets at once.
+
+    Footprints are grouped by CRS so that all the vertices of a group
+    are reprojected with a single `rasterio.warp.transform` call.
+
+    Args:
+        bounds (sequence of tuple): datasets bounds (left, bottom, right, top).
+        crs (rasterio.crs.CRS or sequence): CRS of all the datasets, or one CRS per dataset.
+        densify_pts (int): number of points to add to each edge to account for nonlinear edges transformation (default to 0).
+        precision (int): round geometry coordinates to this number of decimal (default to -1, no rounding).
+        geographic_crs (rasterio.crs.CRS): geographic coordinate reference system (default to EPSG:4326).
+
+    Returns:
+        list: `bbox` and `footprint` for each dataset (same order as `bounds`).
+
+    """
     if densify_pts < 0:
         raise ValueError("`densify_pts` must be positive")
 
-    if src_dst.crs is not None:
-        # 1. Create Polygon from raster bounds
-        geom = bbox_to_geom(src_dst.bounds)
-
-        # 2. Densify the Polygon geometry
-        if src_dst.crs != geographic_crs and densify_pts:
-            # Derived from code found at
-            # https://stackoverflow.com/questions/64995977/generating-equidistance-points-along-the-boundary-of-a-polygon-but-cw-ccw
-            coordinates = numpy.asarray(geom["coordinates"][0])
-
-            densified_number = len(coordinates) * densify_pts
-            existing_indices = numpy.arange(0, densified_number, densify_pts)
-            interp_indices = numpy.arange(existing_indices[-1] + 1)
-            interp_x = numpy.interp(interp_indices, existing_indices, coordinates[:, 0])
-            interp_y = numpy.interp(interp_indices, existing_indices, coordinates[:, 1])
-            geom = {
-                "type": "Polygon",
-                "coordinates": [[(x, y) for x, y in zip(interp_x, interp_y)]],
+    if crs is None or isinstance(crs, rasterio.crs.CRS):
+        crs = [crs] * len(bounds)
+
+    if len(crs) != len(bounds):
+        raise ValueError("`crs` must have the same length as `bounds`")
+
+    # Group datasets by CRS object first (hashing a CRS is slow) then by CRS equality
+    objects: Dict[int, Tuple[rasterio.crs.CRS, List[int]]] = {}
+    results: List[Dict] = [{}] * len(bounds)
+    for idx, dataset_crs in enumerate(crs):
+        if dataset_crs is None:
+            warnings.warn(
+                "Input file doesn't have CRS information, setting geometry and bbox to (-180,-90,180,90)."
+            )
+            bbox = (-180.0, -90.0, 180.0, 90.0)
+            results[idx] = {"bbox": list(bbox), "footprint": bbox_to_geom(bbox)}
+        else:
+            objects.setdefault(id(dataset_crs), (dataset_crs, []))[1].append(idx)
+
+    groups: Dict[rasterio.crs.CRS, List[int]] = {}
+    for dataset_crs, indexes in objects.values():
+        groups.setdefault(dataset_crs, []).extend(indexes)
+
+    for src_crs, indexes in groups.items():
+        # 1. Create Polygons from datasets bounds, shape: (N, 5, 2)
+        left, bottom, right, top = numpy.asarray(
+            [bounds[idx] for idx in indexes], dtype="float64"
+        ).T
+        rings = numpy.stack(
+            [
+                numpy.stack([left, bottom], axis=-1),
+                numpy.stack([right, bottom], axis=-1),
+                numpy.stack([right, top], axis=-1),
+                numpy.stack([left, top], axis=-1),
+                numpy.stack([left, bottom], axis=-1),
+            ],
+            axis=1,
+        )
+
+        # 2. Densify the Polygons
+        if src_crs != geographic_crs and densify_pts:
+            rings = _densify_rings(rings, densify_pts)
+
+        # 3. Reproject all the vertices at once
+        xs, ys = warp.transform(
+            src_crs, geographic_crs, rings[..., 0].ravel(), rings[..., 1].ravel()
+        )
+        coords = numpy.stack([xs, ys], axis=-1).reshape(rings.shape)
+        if precision >= 0:
+            coords = numpy.round(coords, precision)
+
+        mins = coords.min(axis=1)
+        maxs = coords.max(axis=1)
+
+        # Polygons crossing the antimeridian (or which could not be reprojected)
+        # need to be cut by `transform_geom`
+        invalid = ~numpy.isfinite(coords).all(axis=(1, 2))
+        if geographic_crs.is_geographic:
+            invalid |= maxs[:, 0] - mins[:, 0] > 180
+
+        for idx, ring, src_ring, bbox, is_invalid in zip(
+            indexes,
+            coords.tolist(),
+            rings,
+            numpy.concatenate([mins, maxs], axis=1).tolist(),
+            invalid,
+        ):
+            if is_invalid:
+                geom = warp.transform_geom(
+                    src_crs,
+                    geographic_crs,
+                    {"type": "Polygon", "coordinates": [src_ring.tolist()]},
+                    precision=precision,
+                )
+                results[idx] = {"bbox": list(feature_bounds(geom)), "footprint": geom}
+                continue
+
+            results[idx] = {
+                "bbox": bbox,
+                "footprint": {"type": "Polygon", "coordinates": [ring]},
             }
 
-        # 3. Reproject the geometry to "epsg:4326"
-        geom = warp.transform_geom(src_dst.crs, geographic_crs, geom, precision=precision)
-        bbox = feature_bounds(geom)
+    return results
+
+
+def _simplify_ring(ring: numpy.ndarray, tolerance: float) -> numpy.ndarray:
+    """Simplify a closed ring using the Douglas-Peucker algorithm."""
+    keep = numpy.zeros(len(ring), dtype="bool")
+    keep[0] = keep[-1] = True
+
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        points = ring[start + 1 : end] - ring[start]
+        segment = ring[end] - ring[start]
+        norm = numpy.hypot(*segment)
+        if norm:
+            cross = segment[0] * points[:, 1] - segment[1] * points[:, 0]
+            distances = numpy.abs(cross) / norm
+        else:
+            # closed ring: use the distance to the first vertex
+            distances = numpy.hypot(points[:, 0], points[:, 1])
+
+        idx = int(numpy.argmax(distances))
+        if distances[idx] > tolerance:
+            idx += start + 1
+            keep[idx] = True
+            stack.extend([(start, idx), (idx, end)])
+
+    return ring[keep]
+
+
+def _ring_area(ring: numpy.ndarray) -> float:
+    """Get the area of a ring (Shoelace formula)."""
+    x, y = ring[:, 0], ring[:, 1]
+    return abs(float(numpy.dot(x[:-1], y[1:]) - numpy.dot(x[1:], y[:-1]))) / 2
+
+
+def _get_mask_rings(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    max_size: int = 512,
+    max_vertices: int = 256,
+) -> List[numpy.ndarray]:
+    """Get the outlines of the valid pixels (in the dataset CRS).
+
+    The dataset mask is read at a decimated resolution (at most `max_size` pixels along its largest dimension),
+    polygonized and simplified until the outlines have less than `max_vertices` vertices in total.
+    Holes are ignored and the smallest polygons are dropped when they don't fit in the vertices budget.
+
+    """
+    if max_vertices < 4:
+        raise ValueError("`max_vertices` must be greater than 3")
+
+    height, width = src_dst.height, src_dst.width
+    ratio = max(height, width) / max_size
+    if ratio > 1:
+        height, width = (
+            math.ceil(src_dst.height / ratio),
+            math.ceil(src_dst.width / ratio),
+        )
+
+    mask = src_dst.dataset_mask(out_shape=(height, width))
+
+    # Exterior rings (in pixel coordinates) sorted by area
+    rings = [
+        numpy.asarray(geom["coordinates"][0], dtype="float64")
+        for geom, _ in shapes(mask, mask=mask > 0)
+    ]
+    rings = sorted(rings, key=_ring_area, reverse=True)
+
+    outlines: List[numpy.ndarray] = []
+    tolerance = 0.0
+    while rings:
+        simplified = [
+            ring
+            for ring in (_simplify_ring(ring, tolerance) for ring in rings)
+            if len(ring) > 3
+        ]
+        # The largest polygon collapsed, keep the previous outlines
+        if not simplified:
+            break
+
+        selection = []
+        nvertices = 0
+        for ring in simplified:
+            if nvertices + len(ring) > max_vertices:
+                break
+            selection.append(ring)
+            nvertices += len(ring)
+
+        if not selection:
+            tolerance = tolerance * 2 or 0.5
+            continue
+
+        outlines = selection
+        if len(selection) == len(simplified):
+            break
+
+        tolerance = tolerance * 2 or 0.5
+
+    # From (decimated) pixel to dataset coordinates
+    tr = src_dst.transform
+    scale = numpy.array([src_dst.width / width, src_dst.height / height])
+    outlines = [ring * scale for ring in outlines]
+    return [
+        numpy.stack(
+            [
+                tr.a * ring[:, 0] + tr.b * ring[:, 1] + tr.c,
+                tr.d * ring[:, 0] + tr.e * ring[:, 1] + tr.f,
+            ],
+            axis=-1,
+        )
+        for ring in outlines
+    ]
+
+
+def get_dataset_geom(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    densify_pts: int = 0,
+    precision: int = -1,
+    geographic_crs: rasterio.crs.CRS = EPSG_4326,
+    from_mask: bool = False,
+    mask_max_size: int = 512,
+    max_vertices: int = 256,
+) -> Dict:
+    """Get Raster Footprint.
+
+    Args:
+        src_dst (rasterio.io.DatasetReader): Rasterio dataset.
+        densify_pts (int): number of points to add to each edge to account for nonlinear edges transformation (default to 0).
+        precision (int): round geometry coordinates to this number of decimal (default to -1, no rounding).
+        geographic_crs (rasterio.crs.CRS): geographic coordinate reference system (default to EPSG:4326).
+        from_mask (bool): use the outline of the valid pixels instead of the dataset bounds (default to False).
+        mask_max_size (int): maximum size of the mask used to get the valid pixels outline (default to 512).
+        max_vertices (int): maximum number of vertices of the valid pixels outline (default to 256).
+
+    Returns:
+        dict: `bbox` and `footprint`.
+
+    """
+    if from_mask and src_dst.crs is not None:
+        if densify_pts < 0:
+            raise ValueError("`densify_pts` must be positive")
+
+        rings = _get_mask_rings(
+            src_dst, max_size=mask_max_size, max_vertices=max_vertices
+        )
+        if rings:
+            if src_dst.crs != geographic_crs and densify_pts:
+                rings = [_densify_rings(ring[None], densify_pts)[0] for ring in rings]
+
+            polygons = [[ring.tolist()] for ring in rings]
+            geom = (
+                {"type": "Polygon", "coordinates": polygons[0]}
+                if len(polygons) == 1
+                else {"type": "MultiPolygon", "coordinates": polygons}
+            )
+            geom = warp.transform_geom(
+                src_dst.crs, geographic_crs, geom, precision=precision
+            )
+            return {"bbox": list(feature_bounds(geom)), "footprint": geom}
 
-    else:
         warnings.warn(
-            "Input file doesn't have CRS information, setting geometry and bbox to (-180,-90,180,90)."
+            "Input file doesn't have valid pixels, using the dataset bounds as geometry."
         )
-        bbox = (-180.0, -90.0, 180.0, 90.0)
-        geom = bbox_to_geom(bbox)
 
-    return {"bbox": list(bbox), "footprint": geom}
+    return get_dataset_geoms(
+        [src_dst.bounds],
+        src_dst.crs,
+        densify_pts=densify_pts,
+        precision=precision,
+        geographic_crs=geographic_crs,
+    )[0]
+
+
+@functools.lru_cache(maxsize=512)
+def _get_crs_info(crs: rasterio.crs.CRS) -> Dict:
+    """Get EPSG code or WKT2/PROJJSON representations of a CRS.
+
+    Results are cached (by CRS) because PROJ lookups can be slow, especially for non-EPSG CRS.
+
+    """
+    # EPSG
+    epsg = crs.to_epsg() if crs.is_epsg_code else None
+
+    info: Dict = {"epsg": epsg}
+    if not epsg:
+        # WKT2
+        try:
+            info["wkt2"] = crs.to_wkt()
+        except Exception as ex:
+            warnings.warn(f"Could not get WKT2 from dataset : {ex}")
+            # PROJJSON
+            try:
+                info["projjson"] = crs.to_dict(projjson=True)
+            except (AttributeError, TypeError) as ex:
+                warnings.warn(f"Could not get PROJJSON from dataset : {ex}")
+
+    return info
 
 
 def get_projection_info(
@@ -101,31 +470,19 @@ def get_projection_info(
 
     """
 
-    epsg = None
-    if src_dst.crs is not None:
-        # EPSG
-        epsg = src_dst.crs.to_epsg() if src_dst.crs.is_epsg_code else None
+    crs_info = (
+        copy.deepcopy(_get_crs_info(src_dst.crs)) if src_dst.crs is not None else {}
+    )
 
     meta = {
-        "epsg": epsg,
+        "epsg": crs_info.pop("epsg", None),
         "geometry": bbox_to_geom(src_dst.bounds),
         "bbox": list(src_dst.bounds),
         "shape": [src_dst.height, src_dst.width],
         "transform": list(src_dst.transform),
+        **crs_info,
     }
 
-    if not epsg and src_dst.crs:
-        # WKT2
-        try:
-            meta["wkt2"] = src_dst.crs.to_wkt()
-        except Exception as ex:
-            warnings.warn(f"Could not get WKT2 from dataset : {ex}")
-            # PROJJSON
-            try:
-                meta["projjson"] = src_dst.crs.to_dict(projjson=True)
-            except (AttributeError, TypeError) as ex:
-                warnings.warn(f"Could not get PROJJSON from dataset : {ex}")
-
     return meta
 
 
@@ -156,38 +513,107 @@ def get_eobands_info(
     return eo_bands
 
 
-def _get_stats(
-    arr: numpy.ma.MaskedArray,
-    bins: Union[int, str, Sequence] = 10,
+def _get_integer_stats(
+    valid: numpy.ndarray,
+    size: int,
+    bins: Union[int, Sequence] = 10,
     range: Optional[Tuple[float, float]] = None,
+    percentiles: Optional[Sequence[float]] = None,
 ) -> Dict:
-    """Calculate array statistics."""
-    # Avoid non masked nan/inf values
-    arr = numpy.ma.fix_invalid(arr, copy=True)
+    """Calculate statistics for 8 or 16 bits integer values from their counts."""
+    values, counts = _get_value_counts(valid)
+
+    mean = numpy.dot(values, counts) / valid.size
+    variance = numpy.dot((values - mean) ** 2, counts) / valid.size
 
     stats = {
         "statistics": {
-            "mean": arr.mean().item(),
-            "minimum": arr.min().item(),
-            "maximum": arr.max().item(),
-            "stddev": arr.std().item(),
-            "valid_percent": float(
-                numpy.count_nonzero(~arr.mask) / float(arr.data.size) * 100
-            ),
+            "mean": float(mean),
+            "minimum": values[0].item(),
+            "maximum": values[-1].item(),
+            "stddev": math.sqrt(variance),
+            "valid_percent": float(valid.size / size * 100),
         }
     }
 
+    if percentiles:
+        values_percentiles = _get_percentiles(values, counts, percentiles)
+        stats["statistics"].update(
+            {percentile_name(p): v for p, v in zip(percentiles, values_percentiles)}
+        )
+
+    # Histogram of the unique values weighted by their counts
+    sample, edges = numpy.histogram(values, bins=bins, range=range, weights=counts)
+    stats["histogram"] = {
+        "count": len(edges),
+        "min": float(edges.min()),
+        "max": float(edges.max()),
+        "buckets": sample.tolist(),
+    }
+
+    return stats
+
+
+def _get_stats(
+    arr: numpy.ma.MaskedArray,
+    bins: Union[int, str, Sequence] = 10,
+    range: Optional[Tuple[float, float]] = None,
+    percentiles: Optional[Sequence[float]] = None,
+) -> Dict:
+    """Calculate array statistics.
+
+    Requested `percentiles` are exact (calculated from all the valid values).
+
+    """
+    # Only one (compressed) copy of the valid values is used for all the statistics
+    valid = _get_valid_values(arr)
+
+    # Fast path for 8 and 16 bits integer data
+    if valid.size and valid.dtype.itemsize <= 2 and valid.dtype.kind in "ui":
+        if not isinstance(bins, str):
+            return _get_integer_stats(
+                valid, arr.size, bins=bins, range=range, percentiles=percentiles
+            )
+
+    if valid.size:
+        stats = {
+            "statistics": {
+                "mean": valid.mean(dtype="float64").item(),
+                "minimum": valid.min().item(),
+                "maximum": valid.max().item(),
+                "stddev": valid.std(dtype="float64").item(),
+                "valid_percent": float(valid.size / arr.size * 100),
+            }
+        }
+
+        if percentiles:
+            values_percentiles = numpy.percentile(valid, percentiles).tolist()
+            stats["statistics"].update(
+                {percentile_name(p): v for p, v in zip(percentiles, values_percentiles)}
+            )
+
+    else:
+        stats = {
+            "statistics": {
+                "mean": 0.0,
+                "minimum": 0.0,
+                "maximum": 0.0,
+                "stddev": 0.0,
+                "valid_percent": 0.0,
+            }
+        }
+
     try:
-        sample, edges = numpy.histogram(arr[~arr.mask], bins=bins, range=range)
+        sample, edges = numpy.histogram(valid, bins=bins, range=range)
 
     except ValueError as e:
         if "Too many bins for data range." in str(e):
-            _, counts = numpy.unique(arr[~arr.mask], return_counts=True)
+            _, counts = numpy.unique(valid, return_counts=True)
             warnings.warn(
                 f"Could not calculate the histogram, fall back to automatic bin={len(counts) + 1}.",
                 UserWarning,
             )
-            sample, edges = numpy.histogram(arr[~arr.mask], bins=len(counts) + 1)
+            sample, edges = numpy.histogram(valid, bins=len(counts) + 1)
         else:
             raise e
 
@@ -201,115 +627,1026 @@ def _get_stats(
     return stats
 
 
-def get_raster_info(  # noqa: C901
+def _get_windows(
     src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
-    max_size: int = 1024,
-    histogram_bins: Union[int, str, Sequence] = 10,
-    histogram_range: Optional[Tuple[float, float]] = None,
-) -> List[Dict]:
-    """Get raster metadata.
+    min_size: int = 512 * 512,
+) -> Iterator[Window]:
+    """Get windows aligned with the dataset internal blocks.
 
-    see: https://github.com/stac-extensions/raster#raster-band-object
+    For stripped datasets, multiple strips are combined to reduce the number of reads.
 
     """
-    height = src_dst.height
-    width = src_dst.width
-    if max_size:
-        if max(width, height) > max_size:
-            ratio = height / width
-            if ratio > 1:
-                height = max_size
-                width = math.ceil(height / ratio)
-            else:
-                width = max_size
-                height = math.ceil(width * ratio)
+    block_height, block_width = src_dst.block_shapes[0]
+    if block_width < src_dst.width:
+        for _, window in src_dst.block_windows(1):
+            yield window
 
-    meta: List[Dict] = []
+    else:
+        step = block_height * max(1, min_size // (block_height * src_dst.width))
+        for row in range(0, src_dst.height, step):
+            yield Window(0, row, src_dst.width, min(step, src_dst.height - row))
 
-    area_or_point = src_dst.tags().get("AREA_OR_POINT", "").lower()
 
-    # Missing `bits_per_sample` and `spatial_resolution`
-    for band in src_dst.indexes:
-        value = {
-            "data_type": src_dst.dtypes[band - 1],
-            "scale": src_dst.scales[band - 1],
-            "offset": src_dst.offsets[band - 1],
-        }
-        if area_or_point:
-            value["sampling"] = area_or_point
+def _accumulate_windows(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    windows: Sequence[Window],
+    edges: Sequence[Optional[numpy.ndarray]],
+    timings: Optional[Dict[str, float]] = None,
+    sketch_edges: Optional[Sequence[Optional[numpy.ndarray]]] = None,
+) -> List[StatisticsAccumulator]:
+    """Accumulate the statistics of each band over the windows."""
+    stats = [
+        StatisticsAccumulator(edges=e, sketch_edges=s)
+        for e, s in zip(edges, sketch_edges or [None] * len(edges))
+    ]
+    for window in windows:
+        with _timer(timings, "raster_read"):
+            data = src_dst.read(window=window, masked=True)
+
+        with _timer(timings, "raster_stats"):
+            for ix, arr in enumerate(data):
+                stats[ix].update(arr)
 
-        # If the Nodata is not set we don't forward it.
-        if src_dst.nodata is not None:
-            if numpy.isnan(src_dst.nodata):
-                value["nodata"] = "nan"
-            elif numpy.isposinf(src_dst.nodata):
-                value["nodata"] = "inf"
-            elif numpy.isneginf(src_dst.nodata):
-                value["nodata"] = "-inf"
-            else:
-                value["nodata"] = src_dst.nodata
+    return stats
 
-        if src_dst.units[band - 1] is not None:
-            value["unit"] = src_dst.units[band - 1]
 
-        value.update(
-            _get_stats(
-                src_dst.read(indexes=band, out_shape=(height, width), masked=True),
-                bins=histogram_bins,
-                range=histogram_range,
+def _get_blockwise_stats(  # noqa: C901
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    bins: Union[int, str, Sequence] = 10,
+    range: Optional[Tuple[float, float]] = None,
+    timings: Optional[Dict[str, float]] = None,
+    num_threads: int = 1,
+    percentiles: Optional[Sequence[float]] = None,
+) -> List[Dict]:
+    """Calculate exact statistics for each band by iterating over the dataset blocks.
+
+    With `num_threads > 1` (and a dataset opened from a path), the windows are split between
+    threads, each one reading with its own dataset handle, and the partial statistics are merged.
+
+    Requested `percentiles` are estimated from a fine histogram (see `rio_stac.statistics.get_sketch_edges`).
+    For 8 and 16 bits integer data, the fine histogram has one bin per value of the data type range and
+    the histogram is derived from it, so the data is read once. For other data types, the fine histogram
+    (and the histogram, when its range is not set) is calculated between the band minimum and maximum,
+    in a second pass.
+
+    """
+    if isinstance(bins, str):
+        raise ValueError(
+            "Blockwise statistics only support fixed histogram bins (int or sequence)"
+        )
+
+    windows = list(_get_windows(src_dst))
+    num_threads = min(num_threads, len(windows))
+
+    def _accumulate_chunk(
+        chunk: Sequence[Window],
+        edges: Sequence[Optional[numpy.ndarray]],
+        sketch_edges: Optional[Sequence[Optional[numpy.ndarray]]],
+    ) -> Tuple[List[StatisticsAccumulator], Optional[Dict[str, float]]]:
+        chunk_timings: Optional[Dict[str, float]] = {} if timings is not None else None
+        with rasterio.open(src_dst.name, driver=src_dst.driver) as dst:
+            return (
+                _accumulate_windows(dst, chunk, edges, chunk_timings, sketch_edges),
+                chunk_timings,
+            )
+
+    def _accumulate(
+        edges: Sequence[Optional[numpy.ndarray]],
+        sketch_edges: Optional[Sequence[Optional[numpy.ndarray]]] = None,
+    ) -> List[StatisticsAccumulator]:
+        if num_threads <= 1 or not isinstance(src_dst, DatasetReader):
+            return _accumulate_windows(src_dst, windows, edges, timings, sketch_edges)
+
+        # Interleave the windows so each thread gets blocks from the whole dataset
+        chunks = [windows[offset::num_threads] for offset in numpy.arange(num_threads)]
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            results = list(
+                executor.map(lambda c: _accumulate_chunk(c, edges, sketch_edges), chunks)
             )
+
+        stats, _ = results[0]
+        for chunk_stats, _ in results[1:]:
+            for s, other in zip(stats, chunk_stats):
+                s.merge(other)
+
+        if timings is not None:
+            for _, chunk_timings in results:
+                for name, value in (chunk_timings or {}).items():
+                    timings[name] = timings.get(name, 0.0) + value
+
+        return stats
+
+    fixed_edges = None
+    if not isinstance(bins, int):
+        fixed_edges = numpy.asarray(bins, dtype="float64")
+    elif range is not None:
+        fixed_edges = numpy.histogram_bin_edges([], bins=bins, range=range)
+
+    # Fixed histogram edges: we only need one pass
+    if fixed_edges is not None and not percentiles:
+        return [s.finalize() for s in _accumulate([fixed_edges] * src_dst.count)]
+
+    # 8 and 16 bits integer data: percentiles and histogram derived from
+    # one bin per value of the data type range (single pass)
+    if all(
+        numpy.dtype(dtype).itemsize <= 2 and numpy.dtype(dtype).kind in "ui"
+        for dtype in src_dst.dtypes
+    ):
+        stats = _accumulate(
+            [fixed_edges] * src_dst.count,
+            [
+                get_sketch_edges(numpy.iinfo(dtype).min, numpy.iinfo(dtype).max, dtype)
+                for dtype in src_dst.dtypes
+            ],
         )
-        meta.append(value)
+        if fixed_edges is None:
+            for s in stats:
+                s.histogram_from_sketch(
+                    numpy.histogram_bin_edges(
+                        [s.minimum, s.maximum] if s.count else [], bins=bins
+                    )
+                )
 
-    return meta
+        return [s.finalize(percentiles) for s in stats]
 
+    # Histogram range and/or percentiles histogram derived from the data (first pass)
+    stats = _accumulate([None] * src_dst.count)
+    edges_per_band = [
+        fixed_edges
+        if fixed_edges is not None
+        else numpy.histogram_bin_edges(
+            [s.minimum, s.maximum] if s.count else [], bins=bins
+        )
+        for s in stats
+    ]
+    sketch_edges = [
+        get_sketch_edges(s.minimum, s.maximum, dtype) if percentiles and s.count else None
+        for s, dtype in zip(stats, src_dst.dtypes)
+    ]
 
-def get_media_type(
+    return [s.finalize(percentiles) for s in _accumulate(edges_per_band, sketch_edges)]
+
+
+def _get_sample_windows(
     src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
-) -> Optional[pystac.MediaType]:
-    """Find MediaType for a raster dataset."""
-    driver = src_dst.driver
+    sample_size: int,
+    seed: int = 0,
+) -> Tuple[List[Window], int]:
+    """Select internal blocks within a `sample_size` pixels budget.
 
-    if driver == "GTiff":
-        if src_dst.crs:
-            return pystac.MediaType.GEOTIFF
-        else:
-            return pystac.MediaType.TIFF
+    The blocks are split in evenly spaced strata and one block is randomly selected in each one.
 
-    elif driver in [
-        "JP2ECW",
-        "JP2KAK",
-        "JP2LURA",
-        "JP2MrSID",
-        "JP2OpenJPEG",
-        "JPEG2000",
-    ]:
-        return pystac.MediaType.JPEG2000
+    Returns the selected windows and the total number of windows.
 
-    elif driver in ["HDF4", "HDF4Image"]:
-        return pystac.MediaType.HDF
+    """
+    windows = list(_get_windows(src_dst))
+    block_size = windows[0].width * windows[0].height
+    count = min(len(windows), max(1, sample_size // block_size))
+    if count == len(windows):
+        return windows, len(windows)
+
+    rng = numpy.random.default_rng(seed)
+    strata = numpy.linspace(0, len(windows), count + 1).astype("int64")
+    return [
+        windows[rng.integers(start, stop)] for start, stop in zip(strata[:-1], strata[1:])
+    ], len(windows)
+
+
+def _get_mean_confidence_interval(
+    counts: numpy.ndarray,
+    sums: numpy.ndarray,
+    population: int,
+    z: float = 1.96,
+) -> Optional[List[float]]:
+    """Get the confidence interval of the mean estimated from a sample of blocks.
+
+    Blocks are clusters of pixels, so the standard error is estimated from the blocks
+    sums (ratio estimator with finite population correction). Returns None when less
+    than 2 blocks have valid pixels.
 
-    elif driver in ["HDF5", "HDF5Image"]:
-        return pystac.MediaType.HDF5
+    """
+    valid = counts > 0
+    counts, sums = counts[valid], sums[valid]
+    size = len(counts)
+    if size < 2:
+        return None
+
+    mean = sums.sum() / counts.sum()
+    variance = (
+        max(0.0, 1 - size / population)
+        * ((sums - mean * counts) ** 2).sum()
+        / (size - 1)
+        / (size * counts.mean() ** 2)
+    )
+    error = z * math.sqrt(variance)
+    return [float(mean - error), float(mean + error)]
 
-    elif driver == "JPEG":
-        return pystac.MediaType.JPEG
 
-    elif driver == "PNG":
-        return pystac.MediaType.PNG
+def _get_sample_stats(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    sample_size: int = 2**20,
+    bins: Union[int, str, Sequence] = 10,
+    range: Optional[Tuple[float, float]] = None,
+    timings: Optional[Dict[str, float]] = None,
+    percentiles: Optional[Sequence[float]] = None,
+) -> List[Dict]:
+    """Calculate approximate statistics from a sample of the dataset internal blocks."""
+    windows, population = _get_sample_windows(src_dst, sample_size)
+
+    with _timer(timings, "raster_read"):
+        blocks = [src_dst.read(window=window, masked=True) for window in windows]
+
+    with _timer(timings, "raster_stats"):
+        stats = []
+        for ix, _ in enumerate(src_dst.indexes):
+            arrs = [block[ix] for block in blocks]
+            band_stats = _get_stats(
+                numpy.ma.concatenate([arr.reshape(-1) for arr in arrs]),
+                bins=bins,
+                range=range,
+                percentiles=percentiles,
+            )
+
+            blocks_stats = [StatisticsAccumulator() for _ in arrs]
+            for block_stats, arr in zip(blocks_stats, arrs):
+                block_stats.update(arr)
+
+            interval = _get_mean_confidence_interval(
+                numpy.array([b.count for b in blocks_stats]),
+                numpy.array([b.sum for b in blocks_stats]),
+                population,
+            )
+            band_stats["statistics_sample"] = {
+                "blocks": len(windows),
+                "total_blocks": population,
+            }
+            if interval is not None:
+                band_stats["statistics_sample"]["mean_confidence_interval"] = interval
+
+            stats.append(band_stats)
+
+    return stats
+
+
+def _get_overview_level(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    max_size: int,
+) -> Optional[int]:
+    """Get the first (largest) overview level with dimensions within `max_size`."""
+    for level, factor in enumerate(src_dst.overviews(1)):
+        if (
+            max(math.ceil(src_dst.width / factor), math.ceil(src_dst.height / factor))
+            <= max_size
+        ):
+            return level
 
-    warnings.warn("Could not determine the media type from GDAL driver.", UserWarning)
     return None
 
 
-def create_stac_item(
-    source: Union[str, DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
-    input_datetime: Optional[datetime.datetime] = None,
-    extensions: Optional[List[str]] = None,
-    collection: Optional[str] = None,
-    collection_url: Optional[str] = None,
-    properties: Optional[Dict] = None,
-    id: Optional[str] = None,
+def _read_decimated(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    max_size: int = 1024,
+) -> Tuple[numpy.ma.MaskedArray, Optional[int]]:
+    """Read all the bands at once, limited by `max_size`.
+
+    Returns the data and the overview level used (if any).
+
+    """
+    height = src_dst.height
+    width = src_dst.width
+    if not max_size or max(width, height) <= max_size:
+        return src_dst.read(masked=True), None
+
+    # Explicitly use an overview level instead of relying on GDAL's selection
+    # so we only fetch the overview's blocks and avoid resampling.
+    level = _get_overview_level(src_dst, max_size)
+    if level is not None:
+        if isinstance(src_dst, DatasetReader):
+            # Open the overview level as a dataset (using OVERVIEW_LEVEL open option)
+            with rasterio.open(
+                src_dst.name, driver=src_dst.driver, OVERVIEW_LEVEL=level
+            ) as ovr_dst:
+                return ovr_dst.read(masked=True), level
+
+        factor = src_dst.overviews(1)[level]
+        height = math.ceil(src_dst.height / factor)
+        width = math.ceil(src_dst.width / factor)
+
+    else:
+        ratio = height / width
+        if ratio > 1:
+            height = max_size
+            width = math.ceil(height / ratio)
+        else:
+            width = max_size
+            height = math.ceil(width * ratio)
+
+    # Read all the bands at once so each (pixel-interleaved) block is only decoded once
+    data = src_dst.read(out_shape=(src_dst.count, height, width), masked=True)
+    return data, level
+
+
+def _get_metadata_stats(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+) -> List[Dict]:
+    """Get statistics stored in the dataset metadata.
+
+    GDAL `STATISTICS_*` band metadata can come from the GDAL_METADATA TIFF tag or from a PAM (.aux.xml) sidecar file.
+
+    """
+    names = {
+        "mean": "STATISTICS_MEAN",
+        "minimum": "STATISTICS_MINIMUM",
+        "maximum": "STATISTICS_MAXIMUM",
+        "stddev": "STATISTICS_STDDEV",
+        "valid_percent": "STATISTICS_VALID_PERCENT",
+    }
+
+    stats: List[Dict] = []
+    for band in src_dst.indexes:
+        tags = src_dst.tags(band)
+        band_stats = {
+            key: float(tags[name]) for key, name in names.items() if name in tags
+        }
+        stats.append({"statistics": band_stats} if band_stats else {})
+
+    return stats
+
+
+def _get_gdal_stats(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    approx: bool = False,
+) -> List[Dict]:
+    """Get statistics calculated by GDAL.
+
+    GDAL saves the statistics in a PAM (.aux.xml) sidecar file when the dataset is closed,
+    so datasets opened from a file are re-opened with PAM disabled to not modify the input.
+
+    """
+    with ExitStack() as ctx:
+        if isinstance(src_dst, DatasetReader) and not src_dst.name.startswith("/vsimem/"):
+            # PAM is configured when the dataset is opened
+            ctx.enter_context(rasterio.Env(GDAL_PAM_ENABLED="NO"))
+            src_dst = ctx.enter_context(
+                rasterio.open(src_dst.name, driver=src_dst.driver)
+            )
+
+        # rasterio>=1.4
+        if hasattr(src_dst, "stats"):
+            results = src_dst.stats(approx=approx)
+        else:
+            results = [
+                src_dst.statistics(band, approx=approx) for band in src_dst.indexes
+            ]
+
+        stats: List[Dict] = []
+        for band, res in zip(src_dst.indexes, results):
+            band_stats = {
+                "mean": res.mean,
+                "minimum": res.min,
+                "maximum": res.max,
+                "stddev": res.std,
+            }
+
+            # GDAL>=3.2
+            if (
+                valid_percent := src_dst.tags(band).get("STATISTICS_VALID_PERCENT")
+            ) is not None:
+                band_stats["valid_percent"] = float(valid_percent)
+
+            stats.append({"statistics": band_stats})
+
+    return stats
+
+
+def get_raster_info(  # noqa: C901
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    max_size: int = 1024,
+    histogram_bins: Union[int, str, Sequence] = 10,
+    histogram_range: Optional[Tuple[float, float]] = None,
+    stats_method: str = "decimated",
+    timings: Optional[Dict[str, float]] = None,
+    sample_size: int = 1024 * 1024,
+    num_threads: int = 1,
+    percentiles: Optional[Sequence[float]] = None,
+) -> List[Dict]:
+    """Get raster metadata.
+
+    Statistics can be calculated using different methods:
+    - `decimated`: read (all the bands at once) a decimated version of the data, limited by `max_size`. When the dataset has overviews, the
+        largest overview level fitting in `max_size` is read directly and its index is set as `overview_level` in the band metadata
+    - `blockwise`: exact statistics calculated by iterating over the dataset internal blocks (only one block in memory per thread).
+        With `num_threads > 1`, the blocks are read and reduced concurrently in a thread pool (one dataset handle per thread)
+    - `sample`: approximate statistics calculated from a sample of the dataset internal blocks, limited by `sample_size` pixels (per band).
+        One block is randomly selected (with a fixed seed) in evenly spaced strata. The number of blocks and the 95% confidence
+        interval of the mean are set as `statistics_sample` in the band metadata
+    - `metadata`: no pixel read, only use statistics already stored in the dataset metadata (if any)
+    - `gdal-approx` and `gdal-exact`: statistics calculated by GDAL (approximate statistics might be calculated from overviews). No histogram
+
+    Requested `percentiles` (between 0 and 100, e.g `[2, 98]`) are added to the band statistics (e.g `percentile_2`) for the `decimated` and `sample`
+    methods (exact, from the values read) and the `blockwise` method (estimated from a fine histogram, exact for 8 and 16 bits integer
+    data, calculated in an additional pass for other data types). The `metadata`, `gdal-approx` and `gdal-exact` methods raise a `ValueError`
+    when `percentiles`, `histogram_range` or non-default `histogram_bins` are requested.
+
+    When a `timings` dictionary is passed, the time (in seconds) spent reading the data and calculating
+    the statistics is added to its `raster_read` and `raster_stats` keys (GDAL statistics are only recorded as `raster_stats`,
+    and the time spent in each thread is summed).
+
+    see: https://github.com/stac-extensions/raster#raster-band-object
+
+    """
+    if percentiles and not all(0 <= p <= 100 for p in percentiles):
+        raise ValueError("`percentiles` must be between 0 and 100")
+
+    if stats_method in ["metadata", "gdal-approx", "gdal-exact"]:
+        if percentiles:
+            raise ValueError(
+                f"`percentiles` are not supported by the `{stats_method}` statistics method"
+            )
+
+        if histogram_range is not None or not (
+            isinstance(histogram_bins, int) and histogram_bins == 10
+        ):
+            raise ValueError(
+                f"Histograms are not supported by the `{stats_method}` statistics method"
+            )
+
+    meta: List[Dict] = []
+
+    area_or_point = src_dst.tags().get("AREA_OR_POINT", "").lower()
+
+    overview_level = None
+    if stats_method == "blockwise":
+        stats = _get_blockwise_stats(
+            src_dst,
+            bins=histogram_bins,
+            range=histogram_range,
+            timings=timings,
+            num_threads=num_threads,
+            percentiles=percentiles,
+        )
+
+    elif stats_method == "sample":
+        stats = _get_sample_stats(
+            src_dst,
+            sample_size=sample_size,
+            bins=histogram_bins,
+            range=histogram_range,
+            timings=timings,
+            percentiles=percentiles,
+        )
+
+    elif stats_method in ["gdal-approx", "gdal-exact"]:
+        with _timer(timings, "raster_stats"):
+            stats = _get_gdal_stats(src_dst, approx=stats_method == "gdal-approx")
+
+    elif stats_method == "metadata":
+        with _timer(timings, "raster_stats"):
+            stats = _get_metadata_stats(src_dst)
+
+    elif stats_method == "decimated":
+        with _timer(timings, "raster_read"):
+            data, overview_level = _read_decimated(src_dst, max_size=max_size)
+
+        with _timer(timings, "raster_stats"):
+            stats = [
+                _get_stats(
+                    arr,
+                    bins=histogram_bins,
+                    range=histogram_range,
+                    percentiles=percentiles,
+                )
+                for arr in data
+            ]
+
+    else:
+        raise ValueError(f"Invalid statistics method: {stats_method}")
+
+    # Missing `bits_per_sample` and `spatial_resolution`
+    for band in src_dst.indexes:
+        value = {
+            "data_type": src_dst.dtypes[band - 1],
+            "scale": src_dst.scales[band - 1],
+            "offset": src_dst.offsets[band - 1],
+        }
+        if area_or_point:
+            value["sampling"] = area_or_point
+
+        # If the Nodata is not set we don't forward it.
+        if src_dst.nodata is not None:
+            if numpy.isnan(src_dst.nodata):
+                value["nodata"] = "nan"
+            elif numpy.isposinf(src_dst.nodata):
+                value["nodata"] = "inf"
+            elif numpy.isneginf(src_dst.nodata):
+                value["nodata"] = "-inf"
+            else:
+                value["nodata"] = src_dst.nodata
+
+        if src_dst.units[band - 1] is not None:
+            value["unit"] = src_dst.units[band - 1]
+
+        value.update(stats[band - 1])
+
+        if overview_level is not None:
+            value["overview_level"] = overview_level
+
+        meta.append(value)
+
+    return meta
+
+
+def get_media_type(
+    src_dst: Union[DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+) -> Optional[pystac.MediaType]:
+    """Find MediaType for a raster dataset."""
+    driver = src_dst.driver
+
+    if driver == "GTiff":
+        if src_dst.crs:
+            return pystac.MediaType.GEOTIFF
+        else:
+            return pystac.MediaType.TIFF
+
+    elif driver in [
+        "JP2ECW",
+        "JP2KAK",
+        "JP2LURA",
+        "JP2MrSID",
+        "JP2OpenJPEG",
+        "JPEG2000",
+    ]:
+        return pystac.MediaType.JPEG2000
+
+    elif driver in ["HDF4", "HDF4Image"]:
+        return pystac.MediaType.HDF
+
+    elif driver in ["HDF5", "HDF5Image"]:
+        return pystac.MediaType.HDF5
+
+    elif driver == "JPEG":
+        return pystac.MediaType.JPEG
+
+    elif driver == "PNG":
+        return pystac.MediaType.PNG
+
+    warnings.warn("Could not determine the media type from GDAL driver.", UserWarning)
+    return None
+
+
+def _get_dataset_metadata(
+    source: Union[str, DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    with_media_type: bool = True,
+    with_proj: bool = False,
+    with_raster: bool = False,
+    with_eo: bool = False,
+    raster_max_size: int = 1024,
+    geom_densify_pts: int = 0,
+    geom_precision: int = -1,
+    geographic_crs: rasterio.crs.CRS = EPSG_4326,
+    histogram_bins: Union[int, str, Sequence] = 10,
+    histogram_range: Optional[Tuple[float, float]] = None,
+    raster_stats_method: str = "decimated",
+    geom_from_mask: bool = False,
+    geom_mask_max_size: int = 512,
+    geom_max_vertices: int = 256,
+    raster_sample_size: int = 1024 * 1024,
+    raster_num_threads: int = 1,
+    raster_percentiles: Optional[Sequence[float]] = None,
+    timings: Optional[Dict[str, float]] = None,
+    session: Optional[Session] = None,
+) -> Dict:
+    """Get all the metadata needed to create a STAC Item from a dataset.
+
+    When a `timings` dictionary is passed, the time (in seconds) spent in each phase is added to it.
+
+    """
+    with ExitStack() as ctx:
+        if session is not None:
+            ctx.enter_context(session.env())
+
+        with _timer(timings, "open"):
+            if isinstance(source, (DatasetReader, DatasetWriter, WarpedVRT)):
+                dataset = source
+            elif session is not None and isinstance(source, str):
+                dataset = ctx.enter_context(session.open(source))
+            else:
+                dataset = ctx.enter_context(rasterio.open(source))
+
+        if dataset.gcps[0]:
+            with _timer(timings, "warped_vrt"):
+                src_dst = ctx.enter_context(
+                    WarpedVRT(
+                        dataset,
+                        src_crs=dataset.gcps[1],
+                        src_transform=transform.from_gcps(dataset.gcps[0]),
+                    )
+                )
+        else:
+            src_dst = dataset
+
+        with _timer(timings, "geometry"):
+            geom = get_dataset_geom(
+                src_dst,
+                densify_pts=geom_densify_pts,
+                precision=geom_precision,
+                geographic_crs=geographic_crs,
+                from_mask=geom_from_mask,
+                mask_max_size=geom_mask_max_size,
+                max_vertices=geom_max_vertices,
+            )
+
+        meta = {
+            "name": dataset.name,
+            **geom,
+            "media_type": get_media_type(dataset) if with_media_type else None,
+            # Try to get datetime from https://gdal.org/user/raster_data_model.html#imagery-domain-remote-sensing
+            "datetime": src_dst.get_tag_item("ACQUISITIONDATETIME", "IMAGERY")
+            or src_dst.get_tag_item("TIFFTAG_DATETIME"),
+        }
+
+        if with_proj:
+            with _timer(timings, "projection"):
+                meta["proj"] = get_projection_info(src_dst)
+
+        if with_raster:
+            meta["raster:bands"] = get_raster_info(
+                dataset,
+                max_size=raster_max_size,
+                histogram_bins=histogram_bins,
+                histogram_range=histogram_range,
+                stats_method=raster_stats_method,
+                timings=timings,
+                sample_size=raster_sample_size,
+                num_threads=raster_num_threads,
+                percentiles=raster_percentiles,
+            )
+
+        if with_eo:
+            with _timer(timings, "eo"):
+                meta["eo:bands"] = get_eobands_info(src_dst)
+                cloudcover = src_dst.get_tag_item("CLOUDCOVER", "IMAGERY")
+                meta["eo:cloud_cover"] = (
+                    int(cloudcover) if cloudcover is not None else None
+                )
+
+    return meta
+
+
+def _get_metadata(
+    source: Union[str, DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    options: Dict,
+    cache: Optional[MetadataCache] = None,
+    session: Optional[Session] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict:
+    """Get the dataset metadata from the cache or from the dataset."""
+    metadata = None
+    cache_key = None
+    if cache is not None and isinstance(source, str):
+        with _timer(timings, "cache"):
+            # The number of threads doesn't change the metadata
+            key_options = {
+                name: value
+                for name, value in options.items()
+                if name != "raster_num_threads"
+            }
+            cache_key = cache.get_key(
+                source,
+                {**key_options, "geographic_crs": options["geographic_crs"].to_wkt()},
+            )
+            if cache_key:
+                metadata = cache.get(cache_key)
+            else:
+                warnings.warn(
+                    f"Could not get the version of {source}, metadata won't be cached.",
+                    UserWarning,
+                )
+
+    if metadata is None:
+        metadata = _get_dataset_metadata(
+            source, **options, timings=timings, session=session
+        )
+        if cache_key:
+            with _timer(timings, "cache"):
+                cache.set(cache_key, metadata)
+
+    return metadata
+
+
+def _get_datetime(
+    input_datetime: Optional[datetime.datetime], dataset_datetime: Optional[str]
+) -> datetime.datetime:
+    """Get the item datetime from the input, the dataset metadata or the current time."""
+    try:
+        dst_datetime = str_to_datetime(dataset_datetime) if dataset_datetime else None
+    except ValueError as err:
+        warnings.warn(f"Could not get parse date: {dataset_datetime}: {err}")
+        dst_datetime = None
+
+    return input_datetime or dst_datetime or datetime.datetime.now(datetime.timezone.utc)
+
+
+def _get_metadata_options(
+    asset_media_type: Optional[Union[str, pystac.MediaType]],
+    raster_percentiles: Optional[Sequence[float]],
+    **options: Any,
+) -> Dict:
+    """Get the `_get_metadata` options from the item creation options."""
+    return {
+        "with_media_type": asset_media_type == "auto",
+        **options,
+        "raster_percentiles": list(raster_percentiles) if raster_percentiles else None,
+    }
+
+
+def _get_extensions(
+    extensions: Optional[List[str]], with_proj: bool, with_raster: bool, with_eo: bool
+) -> List[str]:
+    """Get the item extensions (copy of the input list with the `projection`, `raster` and `eo` schemas)."""
+    extensions = list(extensions or [])
+    if with_proj:
+        extensions.append(
+            f"https://stac-extensions.github.io/projection/{PROJECTION_EXT_VERSION}/schema.json"
+        )
+
+    if with_raster:
+        extensions.append(
+            f"https://stac-extensions.github.io/raster/{RASTER_EXT_VERSION}/schema.json"
+        )
+
+    if with_eo:
+        extensions.append(
+            f"https://stac-extensions.github.io/eo/{EO_EXT_VERSION}/schema.json"
+        )
+
+    return extensions
+
+
+def _create_item(
+    id: str,
+    geometry: Dict,
+    bbox: Sequence[float],
+    properties: Dict,
+    assets: Dict,
+    extensions: List[str],
+    input_datetime: Optional[datetime.datetime],
+    dataset_datetime: Optional[str],
+    collection: Optional[str],
+    collection_url: Optional[str],
+) -> Dict:
+    """Create the STAC Item dictionary (set the datetime property and the collection link)."""
+    if "start_datetime" not in properties and "end_datetime" not in properties:
+        input_datetime = _get_datetime(input_datetime, dataset_datetime)
+
+    properties["datetime"] = datetime_to_str(input_datetime) if input_datetime else None
+
+    links = []
+    # if we add a collection we MUST add a link
+    if collection:
+        links.append(
+            pystac.Link(
+                pystac.RelType.COLLECTION,
+                collection_url or collection,
+                media_type=pystac.MediaType.JSON,
+            ).to_dict()
+        )
+
+    item = {
+        "type": "Feature",
+        "stac_version": pystac.get_stac_version(),
+        "stac_extensions": extensions,
+        "id": id,
+        "geometry": geometry,
+        "bbox": bbox,
+        "properties": properties,
+        "links": links,
+        "assets": assets,
+    }
+    if collection:
+        item["collection"] = collection
+
+    return item
+
+
+def create_stac_item_dict(
+    source: Union[str, DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    input_datetime: Optional[datetime.datetime] = None,
+    extensions: Optional[List[str]] = None,
+    collection: Optional[str] = None,
+    collection_url: Optional[str] = None,
+    properties: Optional[Dict] = None,
+    id: Optional[str] = None,
+    assets: Optional[Dict[str, pystac.Asset]] = None,
+    asset_name: str = "asset",
+    asset_roles: Optional[List[str]] = None,
+    asset_media_type: Optional[Union[str, pystac.MediaType]] = "auto",
+    asset_href: Optional[str] = None,
+    with_proj: bool = False,
+    with_raster: bool = False,
+    with_eo: bool = False,
+    raster_max_size: int = 1024,
+    geom_densify_pts: int = 0,
+    geom_precision: int = -1,
+    geographic_crs: rasterio.crs.CRS = EPSG_4326,
+    histogram_bins: Union[int, str, Sequence] = 10,
+    histogram_range: Optional[Tuple[float, float]] = None,
+    raster_stats_method: str = "decimated",
+    cache: Optional[MetadataCache] = None,
+    geom_from_mask: bool = False,
+    geom_mask_max_size: int = 512,
+    geom_max_vertices: int = 256,
+    timings: bool = False,
+    session: Optional[Session] = None,
+    raster_sample_size: int = 1024 * 1024,
+    raster_num_threads: int = 1,
+    raster_percentiles: Optional[Sequence[float]] = None,
+) -> Dict:
+    """Create a STAC Item dictionary.
+
+    Same as `create_stac_item` but the item is directly created as a dictionary (no `pystac` objects round-trip),
+    which is faster when only the JSON document is needed (e.g to write newline-delimited JSON).
+
+    Returns:
+        dict: STAC Item dictionary.
+
+    """
+    # Copy the inputs to avoid modifying the user's objects (e.g when creating many items)
+    properties = dict(properties or {})
+    asset_roles = asset_roles or []
+
+    options = _get_metadata_options(
+        asset_media_type,
+        raster_percentiles,
+        with_proj=with_proj,
+        with_raster=with_raster,
+        with_eo=with_eo,
+        raster_max_size=raster_max_size,
+        geom_densify_pts=geom_densify_pts,
+        geom_precision=geom_precision,
+        geographic_crs=geographic_crs,
+        histogram_bins=histogram_bins,
+        histogram_range=histogram_range,
+        raster_stats_method=raster_stats_method,
+        geom_from_mask=geom_from_mask,
+        geom_mask_max_size=geom_mask_max_size,
+        geom_max_vertices=geom_max_vertices,
+        raster_sample_size=raster_sample_size,
+        raster_num_threads=raster_num_threads,
+    )
+
+    start = time.perf_counter()
+    phases: Optional[Dict[str, float]] = {} if timings else None
+
+    metadata = _get_metadata(
+        source, options, cache=cache, session=session, timings=phases
+    )
+
+    item_start = time.perf_counter()
+
+    media_type = (
+        metadata["media_type"] if asset_media_type == "auto" else asset_media_type
+    )
+
+    # add projection properties
+    if with_proj:
+        properties.update(
+            {f"proj:{name}": value for name, value in metadata["proj"].items()}
+        )
+
+    # add raster properties
+    raster_info = {}
+    if with_raster:
+        raster_info = {"raster:bands": metadata["raster:bands"]}
+
+    eo_info: Dict[str, List] = {}
+    if with_eo:
+        eo_info = {"eo:bands": metadata["eo:bands"]}
+
+        if metadata["eo:cloud_cover"] is not None:
+            properties.update({"eo:cloud_cover": metadata["eo:cloud_cover"]})
+
+    # item.assets
+    if assets:
+        item_assets = {key: asset.to_dict() for key, asset in assets.items()}
+
+    else:
+        item_assets = {
+            asset_name: pystac.Asset(
+                href=asset_href or metadata["name"],
+                media_type=media_type,
+                extra_fields={**raster_info, **eo_info},
+                roles=asset_roles,
+            ).to_dict()
+        }
+
+    item = _create_item(
+        id or os.path.basename(metadata["name"]),
+        metadata["footprint"],
+        metadata["bbox"],
+        properties,
+        item_assets,
+        _get_extensions(extensions, with_proj, with_raster, with_eo),
+        input_datetime,
+        metadata["datetime"],
+        collection,
+        collection_url,
+    )
+
+    if phases is not None:
+        end = time.perf_counter()
+        phases["item"] = end - item_start
+        phases["total"] = end - start
+        properties["rio_stac:timings"] = phases
+
+    return item
+
+
+class _LazyFields(MutableMapping):
+    """Asset fields computing some of the values on first access."""
+
+    def __init__(self, fields: Dict, keys: List[str], loader: Callable[[], Dict]):
+        """Set the known fields and the keys to get from the loader."""
+        self._fields = fields
+        self._pending = [key for key in keys if key not in fields]
+        self._loader: Optional[Callable[[], Dict]] = loader
+
+    def _load(self):
+        """Compute the pending values."""
+        if self._loader is not None:
+            values = self._loader()
+            for key in self._pending:
+                self._fields[key] = values[key]
+
+            self._pending = []
+            self._loader = None
+
+    def __getitem__(self, key: str) -> Any:
+        """Get a field (computing the pending values if needed)."""
+        if key in self._pending:
+            self._load()
+
+        return self._fields[key]
+
+    def __setitem__(self, key: str, value: Any):
+        """Set a field (the value won't be computed)."""
+        if key in self._pending:
+            self._pending.remove(key)
+
+        self._fields[key] = value
+
+    def __delitem__(self, key: str):
+        """Delete a field (the value won't be computed)."""
+        if key in self._pending:
+            self._pending.remove(key)
+        else:
+            del self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fields names."""
+        yield from list(self._fields)
+        yield from list(self._pending)
+
+    def __len__(self) -> int:
+        """Number of fields."""
+        return len(self._fields) + len(self._pending)
+
+    def __repr__(self) -> str:
+        """Show the fields (without computing the pending values)."""
+        pending = ", ".join(repr(key) for key in self._pending)
+        return f"<_LazyFields {self._fields!r} pending=[{pending}]>"
+
+
+def _get_raster_fields(source: str, options: Dict) -> Dict:
+    """Get the asset `raster:bands` (projection, eo and mask geometry are not computed)."""
+    metadata = _get_metadata(
+        source,
+        _get_metadata_options(
+            None,
+            options["raster_percentiles"],
+            with_raster=True,
+            geographic_crs=options["geographic_crs"],
+            raster_max_size=options["raster_max_size"],
+            histogram_bins=options["histogram_bins"],
+            histogram_range=options["histogram_range"],
+            raster_stats_method=options["raster_stats_method"],
+            raster_sample_size=options["raster_sample_size"],
+            raster_num_threads=options["raster_num_threads"],
+        ),
+        cache=options["cache"],
+        session=options["session"],
+    )
+    return {"raster:bands": metadata["raster:bands"]}
+
+
+def create_stac_item(
+    source: Union[str, DatasetReader, DatasetWriter, WarpedVRT, MemoryFile],
+    input_datetime: Optional[datetime.datetime] = None,
+    extensions: Optional[List[str]] = None,
+    collection: Optional[str] = None,
+    collection_url: Optional[str] = None,
+    properties: Optional[Dict] = None,
+    id: Optional[str] = None,
     assets: Optional[Dict[str, pystac.Asset]] = None,
     asset_name: str = "asset",
     asset_roles: Optional[List[str]] = None,
@@ -324,6 +1661,17 @@ def create_stac_item(
     geographic_crs: rasterio.crs.CRS = EPSG_4326,
     histogram_bins: Union[int, str, Sequence] = 10,
     histogram_range: Optional[Tuple[float, float]] = None,
+    raster_stats_method: str = "decimated",
+    cache: Optional[MetadataCache] = None,
+    geom_from_mask: bool = False,
+    geom_mask_max_size: int = 512,
+    geom_max_vertices: int = 256,
+    timings: bool = False,
+    session: Optional[Session] = None,
+    lazy: bool = False,
+    raster_sample_size: int = 1024 * 1024,
+    raster_num_threads: int = 1,
+    raster_percentiles: Optional[Sequence[float]] = None,
 ) -> pystac.Item:
     """Create a Stac Item.
 
@@ -346,136 +1694,255 @@ def create_stac_item(
         raster_max_size (int): Limit array size from which to get the raster statistics. Defaults to 1024.
         geom_densify_pts (int): Number of points to add to each edge to account for nonlinear edges transformation (Note: GDAL uses 21).
         geom_precision (int): If >= 0, geometry coordinates will be rounded to this number of decimal.
+        raster_stats_method (str): Method used to get the raster statistics (`decimated`, `blockwise`, `sample`, `metadata`, `gdal-approx` or `gdal-exact`). Defaults to `decimated`.
+        cache (rio_stac.cache.MetadataCache, optional): Cache for the dataset metadata. If the source (local path or HTTP(S) URL) didn't change, the dataset won't be opened. Other sources (e.g `s3://`, `/vsis3/`) are not cached.
+        geom_from_mask (bool): Use the outline of the valid pixels (from the dataset mask) as geometry instead of the dataset bounds. Defaults to False.
+        geom_mask_max_size (int): Limit mask size from which to get the valid pixels outline. Defaults to 512.
+        geom_max_vertices (int): Maximum number of vertices of the valid pixels outline (before densification). Defaults to 256.
+        timings (bool): Add the time (in seconds) spent in each phase (`cache`, `open`, `warped_vrt`, `geometry`, `projection`, `raster_read`, `raster_stats`, `eo`, `item` and `total`) in the `rio_stac:timings` property. Defaults to False.
+        session (rio_stac.session.Session, optional): Session holding the GDAL configuration and the opened datasets (see `rio_stac.session.Session`).
+        lazy (bool): Do not read the data when creating the item: the asset `raster:bands` are computed when they are first accessed (or when the item is serialized). Only used with `with_raster=True`, a path or URL `source` and no `assets`. Defaults to False.
+        raster_sample_size (int): Maximum number of pixels (per band) read to calculate the `sample` raster statistics. Defaults to 1024 * 1024.
+        raster_num_threads (int): Number of threads used to calculate the `blockwise` raster statistics. Defaults to 1.
+        raster_percentiles (list of float, optional): Percentiles (between 0 and 100) to add to the raster statistics (e.g `[2, 98]` for `percentile_2` and `percentile_98`).
 
     Returns:
         pystac.Item: valid STAC Item.
 
     """
-    properties = properties or {}
-    extensions = extensions or []
-    asset_roles = asset_roles or []
 
-    with ExitStack() as ctx:
-        if isinstance(source, (DatasetReader, DatasetWriter, WarpedVRT)):
-            dataset = source
-        else:
-            dataset = ctx.enter_context(rasterio.open(source))
+    start = time.perf_counter()
+
+    options = {
+        "input_datetime": input_datetime,
+        "extensions": extensions,
+        "collection": collection,
+        "collection_url": collection_url,
+        "properties": properties,
+        "id": id,
+        "assets": assets,
+        "asset_roles": asset_roles,
+        "asset_media_type": asset_media_type,
+        "asset_href": asset_href,
+        "with_proj": with_proj,
+        "with_raster": with_raster,
+        "with_eo": with_eo,
+        "raster_max_size": raster_max_size,
+        "geom_densify_pts": geom_densify_pts,
+        "geom_precision": geom_precision,
+        "geographic_crs": geographic_crs,
+        "histogram_bins": histogram_bins,
+        "histogram_range": histogram_range,
+        "raster_stats_method": raster_stats_method,
+        "cache": cache,
+        "geom_from_mask": geom_from_mask,
+        "geom_mask_max_size": geom_mask_max_size,
+        "geom_max_vertices": geom_max_vertices,
+        "session": session,
+        "raster_sample_size": raster_sample_size,
+        "raster_num_threads": raster_num_threads,
+        "raster_percentiles": raster_percentiles,
+    }
 
-        if dataset.gcps[0]:
-            src_dst = ctx.enter_context(
-                WarpedVRT(
-                    dataset,
-                    src_crs=dataset.gcps[1],
-                    src_transform=transform.from_gcps(dataset.gcps[0]),
-                )
-            )
-        else:
-            src_dst = dataset
+    lazy = lazy and with_raster and not assets and isinstance(source, str)
 
-        dataset_geom = get_dataset_geom(
-            src_dst,
-            densify_pts=geom_densify_pts,
-            precision=geom_precision,
-            geographic_crs=geographic_crs,
-        )
+    item_dict = create_stac_item_dict(
+        source,
+        asset_name=asset_name,
+        **{**options, "with_raster": not lazy and with_raster},
+        timings=timings,
+    )
+    phases = item_dict["properties"].get("rio_stac:timings")
 
-        media_type = (
-            get_media_type(dataset) if asset_media_type == "auto" else asset_media_type
+    item = pystac.Item.from_dict(item_dict, migrate=False, preserve_dict=False)
+
+    if lazy:
+        # The `raster` extension is declared but the `raster:bands` are only computed when needed
+        item.stac_extensions = _get_extensions(extensions, with_proj, True, with_eo)
+
+        asset = item.assets[asset_name]
+        asset.extra_fields = _LazyFields(  # type: ignore[assignment]
+            asset.extra_fields,
+            ["raster:bands"],
+            functools.partial(_get_raster_fields, source, options),
         )
 
-        if "start_datetime" not in properties and "end_datetime" not in properties:
-            # Try to get datetime from https://gdal.org/user/raster_data_model.html#imagery-domain-remote-sensing
-            acq_date = src_dst.get_tag_item("ACQUISITIONDATETIME", "IMAGERY")
-            tiff_date = src_dst.get_tag_item("TIFFTAG_DATETIME")
-            dst_date = acq_date or tiff_date
-            try:
-                dst_datetime = str_to_datetime(dst_date) if dst_date else None
-            except ValueError as err:
-                warnings.warn(f"Could not get parse date: {dst_date}: {err}")
-                dst_datetime = None
-
-            input_datetime = (
-                input_datetime
-                or dst_datetime
-                or datetime.datetime.now(datetime.timezone.utc)
-            )
+    if phases is not None:
+        end = time.perf_counter()
+        phases["item"] += end - start - phases["total"]
+        phases["total"] = end - start
 
-        # add projection properties
-        if with_proj:
-            extensions.append(
-                f"https://stac-extensions.github.io/projection/{PROJECTION_EXT_VERSION}/schema.json",
-            )
+    return item
 
-            properties.update(
-                {
-                    f"proj:{name}": value
-                    for name, value in get_projection_info(src_dst).items()
-                }
-            )
 
-        # add raster properties
-        raster_info = {}
-        if with_raster:
-            extensions.append(
-                f"https://stac-extensions.github.io/raster/{RASTER_EXT_VERSION}/schema.json",
-            )
+def create_stac_item_from_assets(
+    assets: Dict[str, str],
+    id: str,
+    input_datetime: Optional[datetime.datetime] = None,
+    extensions: Optional[List[str]] = None,
+    collection: Optional[str] = None,
+    collection_url: Optional[str] = None,
+    properties: Optional[Dict] = None,
+    asset_roles: Optional[Dict[str, List[str]]] = None,
+    asset_media_type: Optional[Union[str, pystac.MediaType]] = "auto",
+    with_proj: bool = False,
+    with_raster: bool = False,
+    with_eo: bool = False,
+    raster_max_size: int = 1024,
+    geom_densify_pts: int = 0,
+    geom_precision: int = -1,
+    geographic_crs: rasterio.crs.CRS = EPSG_4326,
+    histogram_bins: Union[int, str, Sequence] = 10,
+    histogram_range: Optional[Tuple[float, float]] = None,
+    raster_stats_method: str = "decimated",
+    cache: Optional[MetadataCache] = None,
+    session: Optional[Session] = None,
+    max_workers: Optional[int] = None,
+    raster_sample_size: int = 1024 * 1024,
+    raster_num_threads: int = 1,
+    raster_percentiles: Optional[Sequence[float]] = None,
+) -> pystac.Item:
+    """Create a Stac Item with multiple assets (e.g one file per band).
 
-            raster_info = {
-                "raster:bands": get_raster_info(
-                    dataset,
-                    max_size=raster_max_size,
-                    histogram_bins=histogram_bins,
-                    histogram_range=histogram_range,
-                )
-            }
+    The assets metadata are calculated concurrently (in a thread pool). The item geometry is
+    the assets footprint if they all share the same, otherwise the union of the assets bounding box
+    (split in two polygons when it crosses the antimeridian, with `minx > maxx` in the item bbox).
+    Projection properties shared by all the assets are set at the item level, the others in each asset.
 
-        eo_info: Dict[str, List] = {}
-        if with_eo:
-            extensions.append(
-                f"https://stac-extensions.github.io/eo/{EO_EXT_VERSION}/schema.json",
-            )
+    Args:
+        assets (dict): Assets name and path or URL (e.g `{"B01": "B01.tif", "B02": "B02.tif"}`).
+        id (str): id to assign to the item.
+        input_datetime (datetime.datetime, optional): datetime associated with the item (default to the first asset datetime).
+        extensions (list of str): input list of extensions to use in the item.
+        collection (str, optional): name of collection the item belongs to.
+        collection_url (str, optional): Link to the STAC Collection.
+        properties (dict, optional): additional properties to add in the item.
+        asset_roles (dict, optional): list of roles for each asset name.
+        asset_media_type (str or pystac.MediaType, optional): assets media type (default to `auto`, derived from each asset).
+        with_proj (bool): Add the `projection` extension and properties (default to False).
+        with_raster (bool): Add the `raster` extension and properties (default to False).
+        with_eo (bool): Add the `eo` extension and properties (default to False).
+        raster_max_size (int): Limit array size from which to get the raster statistics. Defaults to 1024.
+        geom_densify_pts (int): Number of points to add to each edge to account for nonlinear edges transformation (Note: GDAL uses 21).
+        geom_precision (int): If >= 0, geometry coordinates will be rounded to this number of decimal.
+        raster_stats_method (str): Method used to get the raster statistics (`decimated`, `blockwise`, `sample`, `metadata`, `gdal-approx` or `gdal-exact`). Defaults to `decimated`.
+        cache (rio_stac.cache.MetadataCache, optional): Cache for the assets metadata.
+        session (rio_stac.session.Session, optional): Session holding the GDAL configuration and the opened datasets.
+        max_workers (int, optional): maximum number of assets read at the same time (default to the ThreadPoolExecutor default).
+        raster_sample_size (int): Maximum number of pixels (per band) read to calculate the `sample` raster statistics. Defaults to 1024 * 1024.
+        raster_num_threads (int): Number of threads used to calculate the `blockwise` raster statistics. Defaults to 1.
+        raster_percentiles (list of float, optional): Percentiles (between 0 and 100) to add to the raster statistics (e.g `[2, 98]` for `percentile_2` and `percentile_98`).
+
+    Returns:
+        pystac.Item: valid STAC Item.
 
-            eo_info = {"eo:bands": get_eobands_info(src_dst)}
-
-            cloudcover = src_dst.get_tag_item("CLOUDCOVER", "IMAGERY")
-            if cloudcover is not None:
-                properties.update({"eo:cloud_cover": int(cloudcover)})
-
-    # item
-    item = pystac.Item(
-        id=id or os.path.basename(dataset.name),
-        geometry=dataset_geom["footprint"],
-        bbox=dataset_geom["bbox"],
-        collection=collection,
-        stac_extensions=extensions,
-        datetime=input_datetime,
-        properties=properties,
+    """
+    if not assets:
+        raise ValueError("At least one asset is required")
+
+    properties = dict(properties or {})
+    asset_roles = asset_roles or {}
+
+    options = _get_metadata_options(
+        asset_media_type,
+        raster_percentiles,
+        with_proj=with_proj,
+        with_raster=with_raster,
+        with_eo=with_eo,
+        raster_max_size=raster_max_size,
+        geom_densify_pts=geom_densify_pts,
+        geom_precision=geom_precision,
+        geographic_crs=geographic_crs,
+        histogram_bins=histogram_bins,
+        histogram_range=histogram_range,
+        raster_stats_method=raster_stats_method,
+        raster_sample_size=raster_sample_size,
+        raster_num_threads=raster_num_threads,
     )
 
-    # if we add a collection we MUST add a link
-    if collection:
-        item.add_link(
-            pystac.Link(
-                pystac.RelType.COLLECTION,
-                collection_url or collection,
-                media_type=pystac.MediaType.JSON,
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        metadatas = list(
+            executor.map(
+                lambda href: _get_metadata(href, options, cache=cache, session=session),
+                assets.values(),
             )
         )
 
-    # item.assets
-    if assets:
-        for key, asset in assets.items():
-            item.add_asset(key=key, asset=asset)
-
+    # Geometry
+    footprints = [m["footprint"] for m in metadatas]
+    if all(footprint == footprints[0] for footprint in footprints):
+        geometry, bbox = footprints[0], metadatas[0]["bbox"]
     else:
-        item.add_asset(
-            key=asset_name,
-            asset=pystac.Asset(
-                href=asset_href or dataset.name,
-                media_type=media_type,
-                extra_fields={**raster_info, **eo_info},
-                roles=asset_roles,
-            ),
+        # Footprints split at the antimeridian are merged from their parts
+        bbox = _merge_bbox(
+            [
+                feature_bounds({"type": "Polygon", "coordinates": polygon})
+                for footprint in footprints
+                for polygon in (
+                    footprint["coordinates"]
+                    if footprint["type"] == "MultiPolygon"
+                    else [footprint["coordinates"]]
+                )
+            ]
         )
+        geometry = _bbox_to_geom(bbox)
+
+    # Projection properties shared by all the assets are set at the item level
+    shared_proj: Dict = {}
+    if with_proj:
+        shared_proj = {
+            name: value
+            for name, value in metadatas[0]["proj"].items()
+            if all(m["proj"].get(name) == value for m in metadatas[1:])
+        }
+        properties.update({f"proj:{name}": value for name, value in shared_proj.items()})
 
-    return item
+    if with_eo:
+        cloudcover = next(
+            (m["eo:cloud_cover"] for m in metadatas if m["eo:cloud_cover"] is not None),
+            None,
+        )
+        if cloudcover is not None:
+            properties["eo:cloud_cover"] = cloudcover
+
+    item_assets = {}
+    for (name, href), metadata in zip(assets.items(), metadatas):
+        extra_fields: Dict = {}
+        if with_proj:
+            extra_fields.update(
+                {
+                    f"proj:{key}": value
+                    for key, value in metadata["proj"].items()
+                    if key not in shared_proj
+                }
+            )
+
+        if with_raster:
+            extra_fields["raster:bands"] = metadata["raster:bands"]
+
+        if with_eo:
+            extra_fields["eo:bands"] = metadata["eo:bands"]
+
+        item_assets[name] = pystac.Asset(
+            href=href,
+            media_type=metadata["media_type"]
+            if asset_media_type == "auto"
+            else asset_media_type,
+            extra_fields=extra_fields,
+            roles=asset_roles.get(name, []),
+        ).to_dict()
+
+    item = _create_item(
+        id,
+        geometry,
+        bbox,
+        properties,
+        item_assets,
+        _get_extensions(extensions, with_proj, with_raster, with_eo),
+        input_datetime,
+        next((m["datetime"] for m in metadatas if m["datetime"]), None),
+        collection,
+        collection_url,
+    )
+
+    return pystac.Item.from_dict(item, migrate=False, preserve_dict=False)
@@ -0,0 +1,333 @@
+"""Mergeable raster statistics."""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy
+
+
+def _get_valid_values(arr: numpy.ndarray) -> numpy.ndarray:
+    """Get array valid values (not masked and finite) as a 1D array."""
+    data = numpy.ma.getdata(arr)
+    mask = numpy.ma.getmask(arr)
+
+    # Avoid non masked nan/inf values
+    if numpy.issubdtype(data.dtype, numpy.floating):
+        valid_mask = numpy.isfinite(data)
+        if mask is not numpy.ma.nomask:
+            valid_mask &= ~mask
+
+        return data[valid_mask]
+
+    if mask is not numpy.ma.nomask:
+        return data[~mask]
+
+    return data.ravel()
+
+
+def _get_value_counts(valid: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get unique values and counts for 8 or 16 bits integer values using `numpy.bincount`."""
+    nbits = valid.dtype.itemsize * 8
+    if valid.dtype.kind == "i":
+        # Count signed values using their unsigned representation
+        # then roll the counts so the first one is for the minimum value (e.g -32768)
+        counts = numpy.bincount(valid.view(f"uint{nbits}"), minlength=2**nbits)
+        counts = numpy.roll(counts, 2 ** (nbits - 1))
+        offset = -(2 ** (nbits - 1))
+    else:
+        counts = numpy.bincount(valid)
+        offset = 0
+
+    values = numpy.flatnonzero(counts)
+    return values + offset, counts[values]
+
+
+def _get_percentiles(
+    values: numpy.ndarray, counts: numpy.ndarray, percentiles: Sequence[float]
+) -> List[float]:
+    """Get percentiles from sorted values and their counts.
+
+    Percentiles are linearly interpolated between the closest ranks (same as `numpy.percentile`).
+
+    """
+    positions = (counts.sum() - 1) * numpy.asarray(percentiles, dtype="float64") / 100
+    cumulative = numpy.cumsum(counts)
+    lower = numpy.floor(positions)
+    low = values[numpy.searchsorted(cumulative, lower, side="right")]
+    high = values[numpy.searchsorted(cumulative, numpy.ceil(positions), side="right")]
+    return (low + (high - low) * (positions - lower)).tolist()
+
+
+def percentile_name(percentile: float) -> str:
+    """Get the statistics name of a percentile (e.g `percentile_2`, `percentile_99.5`)."""
+    return f"percentile_{percentile:g}"
+
+
+def get_sketch_edges(
+    minimum: float, maximum: float, dtype: str, max_bins: int = 4096
+) -> numpy.ndarray:
+    """Get the bin edges of the histogram used to estimate percentiles.
+
+    Integer values within a 65536 values range get one bin per value (exact percentiles),
+    other values `max_bins` bins between the minimum and the maximum.
+
+    """
+    if numpy.dtype(dtype).kind in "ui" and maximum - minimum < 2**16:
+        return numpy.arange(minimum, maximum + 2, dtype="float64") - 0.5
+
+    return numpy.linspace(minimum, maximum, max_bins + 1)
+
+
+class StatisticsAccumulator:
+    """Partial statistics of array values, which can be updated and merged.
+
+    The accumulator tracks the number of values, the mean, the sum of squared differences
+    from the mean (M2), the minimum, the maximum and, when histogram `edges` are set, the
+    histogram counts. When `sketch_edges` are set (see `get_sketch_edges`), the values are also
+    counted in a fine histogram used to estimate percentiles. Accumulators created for parts
+    of a dataset (blocks, windows) or for multiple datasets can be merged to get the statistics
+    of the whole, without reading the data again. Mean and variance are merged using Chan et al.
+    parallel algorithm.
+
+    ref: https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Parallel_algorithm
+
+    Accumulators are small and cheap to pickle, so they can be sent between processes.
+
+    Attributes:
+        edges (numpy.ndarray): histogram bin edges (or None).
+        histogram (numpy.ndarray): histogram counts (or None).
+        sketch_edges (numpy.ndarray): percentiles histogram bin edges (or None).
+        sketch (numpy.ndarray): percentiles histogram counts (or None).
+        size (int): number of values (including masked and non-finite values).
+        count (int): number of valid values.
+        mean (float): mean of the valid values.
+        m2 (float): sum of squared differences from the mean.
+        minimum (float): minimum valid value.
+        maximum (float): maximum valid value.
+
+    """
+
+    __slots__ = (
+        "edges",
+        "histogram",
+        "sketch_edges",
+        "sketch",
+        "size",
+        "count",
+        "mean",
+        "m2",
+        "minimum",
+        "maximum",
+    )
+
+    def __init__(
+        self,
+        edges: Optional[Union[Sequence[float], numpy.ndarray]] = None,
+        sketch_edges: Optional[Union[Sequence[float], numpy.ndarray]] = None,
+    ):
+        """Set histogram edges and initial values."""
+        self.edges = numpy.asarray(edges, dtype="float64") if edges is not None else None
+        self.histogram = (
+            numpy.zeros(len(self.edges) - 1, dtype="int64")
+            if self.edges is not None
+            else None
+        )
+        self.sketch_edges = (
+            numpy.asarray(sketch_edges, dtype="float64")
+            if sketch_edges is not None
+            else None
+        )
+        self.sketch = (
+            numpy.zeros(len(self.sketch_edges) - 1, dtype="int64")
+            if self.sketch_edges is not None
+            else None
+        )
+        self.size = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def __getstate__(self) -> Tuple:
+        """Pickle the values as a tuple."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple):
+        """Restore the values."""
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    @property
+    def sum(self) -> float:
+        """Sum of the valid values."""
+        return self.mean * self.count
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of the valid values."""
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    @classmethod
+    def from_statistics(cls, statistics: Dict, size: int) -> "StatisticsAccumulator":
+        """Create an accumulator from a STAC statistics object (e.g from a STAC Item `raster:bands`).
+
+        Args:
+            statistics (dict): `mean`, `minimum`, `maximum`, `stddev` and `valid_percent` values.
+            size (int): number of values the statistics were calculated for (e.g `height * width`).
+
+        Returns:
+            StatisticsAccumulator: accumulator (without histogram).
+
+        """
+        acc = cls()
+        acc.size = size
+        acc.count = round(size * statistics.get("valid_percent", 100.0) / 100)
+        if acc.count:
+            acc.mean = statistics["mean"]
+            acc.m2 = statistics.get("stddev", 0.0) ** 2 * acc.count
+            acc.minimum = statistics["minimum"]
+            acc.maximum = statistics["maximum"]
+
+        return acc
+
+    def update(self, arr: numpy.ndarray):
+        """Add array values (masked values and non-finite values are not valid)."""
+        self.size += arr.size
+
+        valid = _get_valid_values(arr)
+        if not valid.size:
+            return
+
+        other = StatisticsAccumulator()
+        other.count = valid.size
+
+        # Fast path for 8 and 16 bits integer data
+        if valid.dtype.itemsize <= 2 and valid.dtype.kind in "ui":
+            values, counts = _get_value_counts(valid)
+            other.mean = float(numpy.dot(values, counts) / valid.size)
+            other.m2 = float(numpy.dot((values - other.mean) ** 2, counts))
+            other.minimum = values[0].item()
+            other.maximum = values[-1].item()
+            if self.histogram is not None:
+                self.histogram += numpy.histogram(
+                    values, bins=self.edges, weights=counts
+                )[0]
+            if self.sketch is not None:
+                self.sketch += numpy.histogram(
+                    values, bins=self.sketch_edges, weights=counts
+                )[0]
+
+        else:
+            other.mean = valid.mean(dtype="float64").item()
+            other.m2 = valid.var(dtype="float64").item() * valid.size
+            other.minimum = valid.min().item()
+            other.maximum = valid.max().item()
+            if self.histogram is not None:
+                self.histogram += numpy.histogram(valid, bins=self.edges)[0]
+            if self.sketch is not None:
+                self.sketch += numpy.histogram(valid, bins=self.sketch_edges)[0]
+
+        self._merge_moments(other)
+
+    def _merge_moments(self, other: "StatisticsAccumulator"):
+        """Merge count, mean, M2, min and max values."""
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def merge(self, other: "StatisticsAccumulator"):
+        """Merge statistics from another accumulator.
+
+        Histograms (and percentiles histograms) are only merged when both accumulators have the same edges.
+
+        """
+        self.size += other.size
+        if not other.count:
+            return
+
+        self._merge_moments(other)
+
+        if self.histogram is not None:
+            if other.histogram is not None and numpy.array_equal(self.edges, other.edges):
+                self.histogram += other.histogram
+            else:
+                self.edges = self.histogram = None
+
+        if self.sketch is not None:
+            if other.sketch is not None and numpy.array_equal(
+                self.sketch_edges, other.sketch_edges
+            ):
+                self.sketch += other.sketch
+            else:
+                self.sketch_edges = self.sketch = None
+
+    def histogram_from_sketch(self, edges: Union[Sequence[float], numpy.ndarray]):
+        """Set the histogram by re-binning the percentiles histogram.
+
+        The histogram is exact when the percentiles histogram has one bin per value (integer data).
+
+        """
+        self.edges = numpy.asarray(edges, dtype="float64")
+        if self.sketch is None or self.sketch_edges is None:
+            self.histogram = numpy.zeros(len(self.edges) - 1, dtype="int64")
+            return
+
+        centers = (self.sketch_edges[:-1] + self.sketch_edges[1:]) / 2
+        self.histogram = numpy.histogram(centers, bins=self.edges, weights=self.sketch)[
+            0
+        ].astype("int64")
+
+    def percentiles(self, percentiles: Sequence[float]) -> Optional[List[float]]:
+        """Estimate percentiles from the percentiles histogram (None if not available).
+
+        Values are approximated by their bin center (exact for integer values with one bin per value).
+
+        """
+        if self.sketch is None or self.sketch_edges is None or not self.count:
+            return None
+
+        centers = (self.sketch_edges[:-1] + self.sketch_edges[1:]) / 2
+        values = _get_percentiles(centers, self.sketch, percentiles)
+        return [min(max(value, self.minimum), self.maximum) for value in values]
+
+    def finalize(self, percentiles: Optional[Sequence[float]] = None) -> Dict:
+        """Return STAC statistics and histogram.
+
+        Requested `percentiles` are added to the statistics (e.g `percentile_2`) when the
+        percentiles histogram is available.
+
+        """
+        stats: Dict = {
+            "statistics": {
+                "mean": self.mean if self.count else 0.0,
+                "minimum": self.minimum if self.count else 0.0,
+                "maximum": self.maximum if self.count else 0.0,
+                "stddev": self.stddev,
+                "valid_percent": self.count / self.size * 100 if self.size else 0.0,
+            }
+        }
+
+        if percentiles and (values := self.percentiles(percentiles)) is not None:
+            stats["statistics"].update(
+                {percentile_name(p): v for p, v in zip(percentiles, values)}
+            )
+
+        if self.histogram is not None and self.edges is not None:
+            stats["histogram"] = {
+                "count": len(self.edges),
+                "min": float(self.edges.min()),
+                "max": float(self.edges.max()),
+                "buckets": self.histogram.tolist(),
+            }
+
+        return stats
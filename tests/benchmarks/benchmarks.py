@@ -0,0 +1,324 @@
+"""rio-stac benchmarks.
+
+$ python -m pytest tests/benchmarks/benchmarks.py --benchmark-only --benchmark-columns 'min, max, mean, median' --benchmark-sort 'name'
+
+Peak memory (Python and numpy allocations, traced with `tracemalloc`) and batch throughput
+are stored in each benchmark `extra_info` (see `--benchmark-json`).
+
+"""
+
+import json
+import os
+import tracemalloc
+import warnings
+
+import numpy
+import pytest
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.transform import from_origin
+
+from rio_stac import create_stac_item, create_stac_item_dict, create_stac_items
+from rio_stac.serialization import dumps
+from rio_stac.stac import (
+    _get_stats,
+    get_dataset_geom,
+    get_dataset_geoms,
+    get_raster_info,
+)
+
+# dtype, number of bands, size, layout, compression
+RASTERS = [
+    ("uint8", 3, 1024, "striped", "none"),
+    ("uint8", 3, 4096, "cog", "deflate"),
+    ("uint16", 1, 4096, "tiled", "deflate"),
+    ("uint16", 4, 2048, "cog", "none"),
+    ("float32", 1, 2048, "striped", "deflate"),
+    ("float32", 1, 4096, "cog", "deflate"),
+]
+
+
+def _peak_memory(func, *args, **kwargs) -> float:
+    """Get the peak memory (in MB) allocated by a function call."""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 1024**2
+
+
+def _make_raster(
+    path: str, dtype: str, count: int, size: int, layout: str, compress: str
+):
+    """Create a synthetic GeoTIFF with a nodata collar (rotated scene like)."""
+    rng = numpy.random.default_rng(0)
+    y, x = numpy.mgrid[0:size, 0:size] / size
+    nodata = 0
+
+    profile = {
+        "driver": "GTiff",
+        "dtype": dtype,
+        "count": count,
+        "width": size,
+        "height": size,
+        "crs": "EPSG:32631",
+        "transform": from_origin(300000, 5000000, 10, 10),
+        "nodata": nodata,
+    }
+    if compress != "none":
+        profile["compress"] = compress
+
+    if layout in ["tiled", "cog"]:
+        profile.update({"tiled": True, "blockxsize": 512, "blockysize": 512})
+
+    # smooth signal (compressible) with some noise
+    scale = 250 if dtype == "uint8" else 10000
+    collar = (x + y < 0.3) | (x + y > 1.7)
+    with rasterio.open(path, "w", **profile) as dst:
+        for bidx in range(1, count + 1):
+            data = (numpy.sin(x * 4 * bidx) * numpy.cos(y * 3) + 1) / 2 * scale
+            data += rng.normal(0, scale / 100, size=(size, size))
+            data = numpy.clip(data, 1, scale).astype(dtype)
+            data[collar] = nodata
+            dst.write(data, bidx)
+
+        if layout == "cog":
+            dst.build_overviews([2, 4, 8, 16], Resampling.average)
+
+
+@pytest.fixture(
+    scope="session",
+    params=RASTERS,
+    ids=["-".join(map(str, r)) for r in RASTERS],
+)
+def raster(request, tmp_path_factory):
+    """Synthetic raster."""
+    path = str(tmp_path_factory.mktemp("rasters") / "raster.tif")
+    _make_raster(path, *request.param)
+    return path
+
+
+@pytest.fixture(scope="session")
+def rasters(tmp_path_factory):
+    """Many small synthetic COGs."""
+    root = tmp_path_factory.mktemp("batch")
+    paths = []
+    for idx in range(32):
+        path = str(root / f"raster_{idx}.tif")
+        _make_raster(path, "uint16", 1, 512, "cog", "deflate")
+        paths.append(path)
+
+    return paths
+
+
+def _get_stats_masked(arr, bins=10, range=None):
+    """Reference `numpy.ma` implementation (rio-stac<=0.12)."""
+    arr = numpy.ma.fix_invalid(arr, copy=True)
+
+    stats = {
+        "statistics": {
+            "mean": arr.mean().item(),
+            "minimum": arr.min().item(),
+            "maximum": arr.max().item(),
+            "stddev": arr.std().item(),
+            "valid_percent": float(
+                numpy.count_nonzero(~arr.mask) / float(arr.data.size) * 100
+            ),
+        }
+    }
+
+    try:
+        sample, edges = numpy.histogram(arr[~arr.mask], bins=bins, range=range)
+    except ValueError:
+        _, counts = numpy.unique(arr[~arr.mask], return_counts=True)
+        sample, edges = numpy.histogram(arr[~arr.mask], bins=len(counts) + 1)
+
+    stats["histogram"] = {
+        "count": len(edges),
+        "min": float(edges.min()),
+        "max": float(edges.max()),
+        "buckets": sample.tolist(),
+    }
+
+    return stats
+
+
+def _make_array(dtype: str, size: int) -> numpy.ma.MaskedArray:
+    """Create a masked array with 10% of masked pixels and some NaN for float data."""
+    rng = numpy.random.default_rng(0)
+    if numpy.issubdtype(numpy.dtype(dtype), numpy.integer):
+        info = numpy.iinfo(dtype)
+        data = rng.integers(
+            max(info.min, -10000), min(info.max, 10000), size=(size, size)
+        ).astype(dtype)
+    else:
+        data = (rng.random((size, size)) * 10000).astype(dtype)
+        data[rng.random((size, size)) < 0.01] = numpy.nan
+
+    mask = rng.random((size, size)) < 0.1
+    return numpy.ma.MaskedArray(data, mask=mask)
+
+
+@pytest.mark.parametrize("implementation", ["numpy.ma", "rio-stac"])
+@pytest.mark.parametrize("size", [256, 1024, 2048])
+@pytest.mark.parametrize("dtype", ["uint8", "int16", "uint16", "float32"])
+def test_get_stats(benchmark, dtype, size, implementation):
+    """Benchmark array statistics calculation."""
+    benchmark.name = f"{dtype}-{size}-{implementation}"
+    benchmark.group = f"statistics {dtype}-{size}"
+
+    arr = _make_array(dtype, size)
+    func = _get_stats if implementation == "rio-stac" else _get_stats_masked
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        stats = benchmark(func, arr)
+
+    assert stats["statistics"]["valid_percent"] < 100
+
+
+@pytest.mark.parametrize("stats_method", ["decimated", "blockwise", "sample"])
+def test_get_raster_info(benchmark, raster, stats_method):
+    """Benchmark raster information (statistics) for a dataset."""
+    benchmark.group = f"raster info {stats_method}"
+
+    def _get_raster_info():
+        with rasterio.open(raster) as src_dst:
+            return get_raster_info(src_dst, stats_method=stats_method)
+
+    benchmark.extra_info["peak_memory_mb"] = _peak_memory(_get_raster_info)
+    info = benchmark(_get_raster_info)
+    if stats_method == "sample":
+        # sampled blocks might not include the nodata pixels
+        assert "statistics_sample" in info[0]
+    else:
+        assert info[0]["statistics"]["valid_percent"] < 100
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 4])
+def test_get_raster_info_threads(benchmark, raster, num_threads):
+    """Benchmark blockwise raster statistics with multiple threads."""
+    benchmark.group = "raster info blockwise threads"
+
+    def _get_raster_info():
+        with rasterio.open(raster) as src_dst:
+            return get_raster_info(
+                src_dst, stats_method="blockwise", num_threads=num_threads
+            )
+
+    info = benchmark(_get_raster_info)
+    assert info[0]["statistics"]["valid_percent"] < 100
+
+
+@pytest.mark.parametrize("from_mask", [False, True])
+def test_get_dataset_geom(benchmark, raster, from_mask):
+    """Benchmark dataset footprint."""
+    benchmark.group = "geometry from mask" if from_mask else "geometry from bounds"
+
+    def _get_dataset_geom():
+        with rasterio.open(raster) as src_dst:
+            return get_dataset_geom(src_dst, densify_pts=21, from_mask=from_mask)
+
+    benchmark.extra_info["peak_memory_mb"] = _peak_memory(_get_dataset_geom)
+    geom = benchmark(_get_dataset_geom)
+    assert geom["footprint"]["type"] == "Polygon"
+
+
+@pytest.mark.parametrize("implementation", ["loop", "vectorized"])
+def test_get_dataset_geoms(benchmark, implementation):
+    """Benchmark footprints for a 10 000 tiles grid."""
+    benchmark.group = "geometries 10000 tiles"
+
+    crs = rasterio.crs.CRS.from_epsg(32631)
+    bounds = [
+        (
+            300000 + col * 1000,
+            5000000 + row * 1000,
+            301000 + col * 1000,
+            5001000 + row * 1000,
+        )
+        for row in range(100)
+        for col in range(100)
+    ]
+
+    def _loop():
+        geoms = []
+        for bbox in bounds:
+            geoms.extend(get_dataset_geoms([bbox], crs, densify_pts=21))
+        return geoms
+
+    def _vectorized():
+        return get_dataset_geoms(bounds, crs, densify_pts=21)
+
+    func = _vectorized if implementation == "vectorized" else _loop
+    benchmark.extra_info["peak_memory_mb"] = _peak_memory(func)
+    geoms = benchmark.pedantic(func, rounds=3)
+    assert len(geoms) == len(bounds)
+
+
+def test_create_stac_item(benchmark, raster):
+    """Benchmark Item creation."""
+    benchmark.group = "create item"
+
+    def _create_stac_item():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return create_stac_item(
+                raster, with_proj=True, with_raster=True, with_eo=True
+            )
+
+    benchmark.extra_info["peak_memory_mb"] = _peak_memory(_create_stac_item)
+    item = benchmark(_create_stac_item)
+    assert item.id == os.path.basename(raster)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_create_stac_items(benchmark, rasters, executor):
+    """Benchmark batch Items creation throughput."""
+    benchmark.group = "create items"
+
+    def _create_stac_items():
+        return list(
+            create_stac_items(
+                rasters,
+                max_workers=4,
+                executor=executor,
+                with_proj=True,
+                with_raster=True,
+                with_eo=True,
+            )
+        )
+
+    items = benchmark.pedantic(_create_stac_items, rounds=3)
+    assert len(items) == len(rasters)
+
+    # No stats with `--benchmark-disable`
+    if benchmark.stats is not None:
+        benchmark.extra_info["items_per_second"] = (
+            len(rasters) / benchmark.stats.stats.mean
+        )
+
+
+@pytest.mark.parametrize("implementation", ["pystac-json", "dict-dumps"])
+def test_serialization(benchmark, implementation):
+    """Benchmark Item serialization (e.g NDJSON output)."""
+    benchmark.group = "serialization"
+
+    src_path = os.path.join(
+        os.path.dirname(__file__), "..", "fixtures", "dataset_cog.tif"
+    )
+    options = {"with_proj": True, "with_raster": True, "with_eo": True}
+    item = create_stac_item(src_path, **options)
+    item_dict = create_stac_item_dict(src_path, **options)
+
+    def _pystac_json():
+        return json.dumps(item.to_dict(), separators=(",", ":"))
+
+    def _dict_dumps():
+        return dumps(item_dict)
+
+    func = _dict_dumps if implementation == "dict-dumps" else _pystac_json
+    assert json.loads(benchmark(func))["id"] == "dataset_cog.tif"
@@ -1,5 +1,11 @@
 """``pytest`` configuration."""
 
+import io
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import rasterio
 
@@ -21,3 +27,50 @@ def runner():
     from click.testing import CliRunner
 
     return CliRunner()
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Simple HTTP handler with (single) Range request support."""
+
+    def send_head(self):
+        """Send response headers and return the file object."""
+        range_header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        if not range_header or not os.path.isfile(path):
+            return super().send_head()
+
+        size = os.path.getsize(path)
+        start, end = range_header.replace("bytes=", "").split("-")
+        start = int(start)
+        end = min(int(end) if end else size - 1, size - 1)
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            body = f.read(end - start + 1)
+
+        self.send_response(206)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def log_message(self, *args):
+        """Do not log requests."""
+        pass
+
+
+@pytest.fixture(scope="session")
+def http_server():
+    """Serve the test fixtures over HTTP (e.g for /vsicurl/ tests)."""
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+    handler = partial(RangeRequestHandler, directory=fixtures)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,121 @@
+"""test batch functions."""
+
+import asyncio
+import datetime
+import os
+
+import pystac
+import pytest
+
+from rio_stac import create_stac_items
+from rio_stac.batch import create_stac_item_async, create_stac_items_async
+
+PREFIX = os.path.join(os.path.dirname(__file__), "fixtures")
+input_date = datetime.datetime.now(datetime.timezone.utc)
+
+files = [
+    os.path.join(PREFIX, "dataset_cog.tif"),
+    os.path.join(PREFIX, "dataset_geo.tif"),
+    os.path.join(PREFIX, "dataset_gcps.tif"),
+    os.path.join(PREFIX, "dataset_int16_nodata.tif"),
+]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_create_stac_items(executor):
+    """Should create all the items."""
+    extensions = ["https://stac-extensions.github.io/scientific/v1.0.0/schema.json"]
+    items = list(
+        create_stac_items(
+            files,
+            max_workers=2,
+            executor=executor,
+            input_datetime=input_date,
+            extensions=extensions,
+            with_proj=True,
+            with_raster=True,
+        )
+    )
+    assert len(items) == len(files)
+    assert all(isinstance(item, pystac.Item) for item in items)
+    assert sorted(item.id for item in items) == sorted(os.path.basename(f) for f in files)
+    for item in items:
+        assert item.validate()
+        assert len(item.stac_extensions) == 3
+
+    # the user's objects should not be modified
+    assert len(extensions) == 1
+
+
+def test_create_stac_items_ordered():
+    """Should keep the sources order."""
+    items = create_stac_items(
+        iter(files * 3), max_workers=2, executor="thread", ordered=True
+    )
+    assert [item.id for item in items] == [os.path.basename(f) for f in files * 3]
+
+
+def test_create_stac_items_errors():
+    """Should report the errors without stopping."""
+    sources = [files[0], os.path.join(PREFIX, "not_a_file.tif"), files[1]]
+
+    errors = []
+    items = list(
+        create_stac_items(
+            sources,
+            max_workers=2,
+            executor="thread",
+            ordered=True,
+            on_error=lambda src, exc: errors.append(src),
+        )
+    )
+    assert len(items) == 2
+    assert errors == [sources[1]]
+
+    with pytest.warns(UserWarning, match="Could not create STAC Item"):
+        items = list(create_stac_items(sources, max_workers=2, executor="process"))
+    assert len(items) == 2
+
+    with pytest.raises(ValueError):
+        list(create_stac_items(sources, executor="cluster"))
+
+
+def test_create_stac_item_async(http_server):
+    """Should create items from remote datasets without blocking the event loop."""
+    sources = [f"{http_server}/{os.path.basename(f)}" for f in files]
+    config = {"GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR"}
+
+    async def _create():
+        item = await create_stac_item_async(
+            sources[0], gdal_config=config, with_raster=True
+        )
+        items = [
+            item
+            async for item in create_stac_items_async(
+                sources, max_concurrency=2, ordered=True, gdal_config=config
+            )
+        ]
+        return item, items
+
+    item, items = asyncio.run(_create())
+    assert item.id == "dataset_cog.tif"
+    assert item.assets["asset"].href == sources[0]
+    assert "raster:bands" in item.assets["asset"].extra_fields
+    assert [item.id for item in items] == [os.path.basename(f) for f in files]
+
+
+def test_create_stac_items_async_errors():
+    """Should report the errors without stopping."""
+    sources = [files[0], os.path.join(PREFIX, "not_a_file.tif"), files[1]]
+
+    async def _create(**kwargs):
+        return [item async for item in create_stac_items_async(sources, **kwargs)]
+
+    errors = []
+    items = asyncio.run(_create(on_error=lambda src, exc: errors.append(src)))
+    assert len(items) == 2
+    assert errors == [sources[1]]
+
+    with pytest.warns(UserWarning, match="Could not create STAC Item"):
+        items = asyncio.run(_create(ordered=True, max_concurrency=1))
+    assert [item.id for item in items] == ["dataset_cog.tif", "dataset_geo.tif"]
@@ -0,0 +1,166 @@
+"""test metadata cache."""
+
+import datetime
+import json
+import os
+import pickle
+import shutil
+
+import pytest
+import rasterio
+from rasterio.io import MemoryFile
+
+from rio_stac import create_stac_item, create_stac_items
+from rio_stac.cache import MetadataCache, get_source_version
+
+PREFIX = os.path.join(os.path.dirname(__file__), "fixtures")
+input_date = datetime.datetime.now(datetime.timezone.utc)
+
+
+def test_metadata_cache(tmp_path):
+    """Should only open the dataset when it changed."""
+    src_path = str(tmp_path / "dataset_cog.tif")
+    shutil.copy(os.path.join(PREFIX, "dataset_cog.tif"), src_path)
+
+    options = {
+        "input_datetime": input_date,
+        "with_proj": True,
+        "with_raster": True,
+        "with_eo": True,
+    }
+
+    with MetadataCache(str(tmp_path / "cache.db")) as cache:
+        item = create_stac_item(src_path, cache=cache, **options)
+        assert cache.misses == 1
+        assert cache.hits == 0
+        assert len(cache) == 1
+
+        item_cached = create_stac_item(src_path, cache=cache, **options)
+        assert cache.misses == 1
+        assert cache.hits == 1
+        assert item_cached.validate()
+        assert json.dumps(item_cached.to_dict()) == json.dumps(item.to_dict())
+
+        # Timings are not part of the cache key
+        item_cached = create_stac_item(src_path, cache=cache, timings=True, **options)
+        assert cache.hits == 2
+        assert list(item_cached.properties["rio_stac:timings"]) == [
+            "cache",
+            "item",
+            "total",
+        ]
+
+        # Number of threads is not part of the cache key
+        create_stac_item(src_path, cache=cache, raster_num_threads=2, **options)
+        assert cache.hits == 3
+
+        # Different options
+        create_stac_item(src_path, cache=cache, input_datetime=input_date)
+        assert cache.misses == 2
+        assert len(cache) == 2
+
+        # Dataset changed
+        stat = os.stat(src_path)
+        os.utime(src_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        create_stac_item(src_path, cache=cache, **options)
+        assert cache.misses == 3
+        assert len(cache) == 3
+
+        # Not a dataset path
+        with open(src_path, "rb") as f:
+            item = create_stac_item(f, cache=cache, input_datetime=input_date)
+        assert cache.misses == 3
+
+    # Persistent
+    with MetadataCache(str(tmp_path / "cache.db"), max_entries=2) as cache:
+        assert len(cache) == 3
+        create_stac_item(src_path, cache=cache, **options)
+        assert cache.hits == 1
+
+        # Least recently used entries are evicted
+        create_stac_item(os.path.join(PREFIX, "dataset_geo.tif"), cache=cache, **options)
+        assert len(cache) == 2
+        create_stac_item(src_path, cache=cache, **options)
+        assert cache.hits == 2
+
+        # Can be sent to other processes
+        cache_copy = pickle.loads(pickle.dumps(cache))
+        create_stac_item(src_path, cache=cache_copy, **options)
+        assert cache_copy.hits == 3
+        cache_copy.close()
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_metadata_cache_counters(tmp_path, executor):
+    """Should count the hits and misses of all the workers."""
+    paths = [
+        os.path.join(PREFIX, "dataset_cog.tif"),
+        os.path.join(PREFIX, "dataset_geo.tif"),
+    ]
+    with MetadataCache(str(tmp_path / "cache.db")) as cache:
+        for _ in range(3):
+            items = create_stac_items(
+                paths,
+                max_workers=2,
+                executor=executor,
+                cache=cache,
+                input_datetime=input_date,
+            )
+            assert len(list(items)) == 2
+
+        assert cache.misses == 2
+        assert cache.hits == 4
+
+        # Counters are not shared with other instances
+        with MetadataCache(str(tmp_path / "cache.db")) as other:
+            assert other.hits == 0
+
+    with MetadataCache(str(tmp_path / "cache.db")) as cache:
+        counters = cache._db.execute("SELECT COUNT(*) FROM counters").fetchone()[0]
+        assert counters == 0
+
+
+def test_metadata_cache_eviction(tmp_path):
+    """Should keep the most recently used entries."""
+    with MetadataCache(str(tmp_path / "cache.db"), max_entries=50) as cache:
+        for i in range(200):
+            cache.set(f"key{i}", {"value": i})
+            # keep the first entry in use
+            assert cache.get("key0") == {"value": 0}
+
+        assert len(cache) == 50
+        assert cache.get("key199") == {"value": 199}
+        assert cache.get("key1") is None
+        indexes = cache._db.execute("PRAGMA index_list(metadata)").fetchall()
+        assert any(index[1] == "metadata_accessed" for index in indexes)
+
+
+def test_source_version(http_server):
+    """Should get dataset version."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    assert get_source_version(src_path)
+    assert get_source_version(f"file://{src_path}") == get_source_version(src_path)
+    assert get_source_version(f"{http_server}/dataset_cog.tif")
+    assert not get_source_version(os.path.join(PREFIX, "not_a_file.tif"))
+    assert not get_source_version(f"{http_server}/not_a_file.tif")
+    assert get_source_version(f"/vsicurl/{http_server}/dataset_cog.tif")
+
+    # Object storage and other virtual file systems are not versioned
+    assert not get_source_version("s3://bucket/dataset_cog.tif")
+    assert not get_source_version("/vsis3/bucket/dataset_cog.tif")
+    assert not get_source_version("/vsigs/bucket/dataset_cog.tif")
+    assert not get_source_version("/vsiaz/container/dataset_cog.tif")
+
+
+def test_metadata_cache_unversioned(tmp_path):
+    """Should warn when the dataset cannot be cached."""
+    with open(os.path.join(PREFIX, "dataset_cog.tif"), "rb") as f:
+        data = f.read()
+
+    with MemoryFile(data, ext=".tif") as mem, rasterio.open(mem.name):
+        with MetadataCache(str(tmp_path / "cache.db")) as cache:
+            with pytest.warns(UserWarning, match="won't be cached"):
+                item = create_stac_item(mem.name, input_datetime=input_date, cache=cache)
+
+            assert item.validate()
+            assert len(cache) == 0
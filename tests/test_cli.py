@@ -3,8 +3,11 @@
 import json
 import os
 
+import numpy
 import pystac
+import rasterio
 
+from rio_stac.scripts import cli
 from rio_stac.scripts.cli import stac
 
 PREFIX = os.path.join(os.path.dirname(__file__), "fixtures")
@@ -132,3 +135,297 @@ def test_rio_stac_cli(runner):
             assert "proj:projjson" not in stac_item["properties"]
             assert "raster:bands" in stac_item["assets"]["asset"]
             assert "eo:bands" in stac_item["assets"]["asset"]
+
+
+def test_rio_stac_cli_batch(runner):
+    """Should create NDJSON items from multiple datasets."""
+    files = [
+        os.path.join(PREFIX, "dataset_cog.tif"),
+        os.path.join(PREFIX, "dataset_gcps.tif"),
+        os.path.join(PREFIX, "dataset_geo.tif"),
+    ]
+
+    with runner.isolated_filesystem():
+        # Glob
+        result = runner.invoke(stac, [os.path.join(PREFIX, "dataset_g*.tif")])
+        assert not result.exception
+        assert result.exit_code == 0
+        items = [json.loads(line) for line in result.output.splitlines()]
+        assert [item["id"] for item in items] == [
+            "dataset_gcps.tif",
+            "dataset_gdalcog.tif",
+            "dataset_geo.tif",
+            "dataset_geom.tif",
+        ]
+
+        # Manifest
+        with open("list.txt", "w") as f:
+            f.write("\n".join(files) + "\n")
+
+        result = runner.invoke(
+            stac, ["list.txt", "--manifest", "--jobs", "2", "-o", "items.ndjson"]
+        )
+        assert not result.exception
+        assert result.exit_code == 0
+        with open("items.ndjson") as f:
+            items = [json.loads(line) for line in f]
+        assert [item["assets"]["asset"]["href"] for item in items] == files
+        assert all("raster:bands" in item["assets"]["asset"] for item in items)
+
+        # stdin
+        result = runner.invoke(
+            stac, ["-", "--without-raster"], input="\n".join(files[:2])
+        )
+        assert not result.exception
+        assert result.exit_code == 0
+        assert len(result.output.splitlines()) == 2
+
+        # Directory with sidecar and non-raster files
+        os.mkdir("data")
+        for name in ["notes.txt", "a.tif.aux.xml", "a.tif.ovr", "a.tif.msk"]:
+            with open(os.path.join("data", name), "w") as f:
+                f.write("not a raster")
+        for name in ["a.tif", "b.TIFF"]:
+            with (
+                open(files[0], "rb") as fin,
+                open(os.path.join("data", name), "wb") as fout,
+            ):
+                fout.write(fin.read())
+
+        result = runner.invoke(stac, ["data"])
+        assert not result.exception
+        assert result.exit_code == 0
+        items = [json.loads(line) for line in result.output.splitlines()]
+        assert [item["id"] for item in items] == ["a.tif", "b.TIFF"]
+
+        result = runner.invoke(stac, ["data", "--include", "a.*"])
+        assert result.exit_code == 1
+        assert "Could not create STAC Item for" in result.output
+        assert "a.tif.ovr" in result.output
+        items = [
+            json.loads(line)
+            for line in result.output.splitlines()
+            if line.startswith("{")
+        ]
+        assert [item["id"] for item in items] == ["a.tif"]
+
+        # Directory or glob without datasets
+        os.mkdir("empty")
+        result = runner.invoke(stac, ["empty"])
+        assert result.exit_code == 2
+        assert "No datasets found" in result.output
+
+        result = runner.invoke(stac, [os.path.join(PREFIX, "nothing_*.tif")])
+        assert result.exit_code == 2
+        assert "No datasets found" in result.output
+
+        result = runner.invoke(stac, ["data", "--id", "myid"])
+        assert result.exit_code == 2
+
+
+def test_rio_stac_cli_single_inputs(runner):
+    """Should treat URLs and directory datasets as single datasets."""
+    assert not cli._is_batch("https://host/dataset.tif?token=abc*", False)
+    assert not cli._is_batch("/vsis3/bucket/data[1].tif", False)
+    assert not cli._is_batch(os.path.join(PREFIX, "dataset_cog.tif"), False)
+    assert cli._is_batch(os.path.join(PREFIX, "dataset_*.tif"), False)
+    assert cli._is_batch(PREFIX, False)
+
+    with runner.isolated_filesystem():
+        with rasterio.open(
+            "dataset.zarr",
+            "w",
+            driver="Zarr",
+            width=10,
+            height=10,
+            count=1,
+            dtype="uint8",
+            crs="epsg:4326",
+            transform=rasterio.transform.from_origin(0, 10, 1, 1),
+        ) as dst:
+            dst.write(numpy.ones((1, 10, 10), dtype="uint8"))
+
+        result = runner.invoke(stac, ["dataset.zarr", "--without-raster"])
+        assert not result.exception
+        assert result.exit_code == 0
+        stac_item = json.loads(result.output)
+        assert stac_item["id"] == "dataset.zarr"
+
+
+def test_rio_stac_cli_stats_method(runner):
+    """Should use the statistics method."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    result = runner.invoke(stac, [src_path, "--stats-method", "blockwise"])
+    assert not result.exception
+    assert result.exit_code == 0
+    stac_item = json.loads(result.output)
+    stats = stac_item["assets"]["asset"]["raster:bands"][0]["statistics"]
+    assert stats["valid_percent"] == 100.0
+
+
+def test_rio_stac_cli_percentiles(runner):
+    """Should add the percentiles to the statistics."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    result = runner.invoke(stac, [src_path, "--percentile", "2", "--percentile", "98"])
+    assert not result.exception
+    assert result.exit_code == 0
+    stac_item = json.loads(result.output)
+    stats = stac_item["assets"]["asset"]["raster:bands"][0]["statistics"]
+    assert "percentile_2" in stats
+    assert "percentile_98" in stats
+
+    result = runner.invoke(stac, [src_path, "--percentile", "120"])
+    assert result.exit_code == 2
+
+    result = runner.invoke(
+        stac, [src_path, "--percentile", "2", "--stats-method", "metadata"]
+    )
+    assert result.exit_code == 2
+    assert "not supported" in result.output
+
+
+def test_rio_stac_cli_geom_from_mask(runner):
+    """Should create the geometry from the dataset mask."""
+    src_path = os.path.join(PREFIX, "dataset_nodata_nan.tif")
+    result = runner.invoke(
+        stac, [src_path, "--geom-from-mask", "--geom-max-vertices", "16"]
+    )
+    assert not result.exception
+    assert result.exit_code == 0
+    stac_item = json.loads(result.output)
+    assert len(stac_item["geometry"]["coordinates"][0]) <= 16
+
+
+def test_rio_stac_cli_profile(runner):
+    """Should write the timings to stderr."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with runner.isolated_filesystem():
+        result = runner.invoke(stac, [src_path, "--profile", "-o", "item.json"])
+        assert not result.exception
+        assert result.exit_code == 0
+
+        record = json.loads(result.output)
+        assert record["id"] == "dataset_cog.tif"
+        assert {"open", "geometry", "raster_read", "raster_stats", "total"}.issubset(
+            record["timings"]
+        )
+
+        with open("item.json", "r") as f:
+            stac_item = json.loads(f.read())
+        assert "rio_stac:timings" not in stac_item["properties"]
+
+
+def test_rio_stac_cli_cache(runner):
+    """Should use the metadata cache."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            stac, [src_path, "--cache", "cache.db", "-d", "2020-01-01"]
+        )
+        assert not result.exception
+        assert result.exit_code == 0
+        assert os.path.exists("cache.db")
+
+        result_cached = runner.invoke(
+            stac, [src_path, "--cache", "cache.db", "-d", "2020-01-01"]
+        )
+        assert not result_cached.exception
+        assert result_cached.output == result.output
+
+        # Cache hits and misses (counted in all the workers)
+        result = runner.invoke(
+            stac,
+            [
+                os.path.join(PREFIX, "dataset_g*.tif"),
+                "--cache",
+                "cache.db",
+                "--jobs",
+                "2",
+                "--profile",
+            ],
+        )
+        assert result.exit_code == 0
+        stats = json.loads(result.stderr.splitlines()[-1])
+        assert stats == {"cache": {"hits": 0, "misses": 4}}
+
+        result = runner.invoke(
+            stac,
+            [
+                os.path.join(PREFIX, "dataset_g*.tif"),
+                "--cache",
+                "cache.db",
+                "--jobs",
+                "2",
+                "--profile",
+            ],
+        )
+        assert result.exit_code == 0
+        stats = json.loads(result.stderr.splitlines()[-1])
+        assert stats == {"cache": {"hits": 4, "misses": 0}}
+
+
+def test_rio_stac_cli_single_no_session(runner, monkeypatch):
+    """Should not use the session GDAL configuration for a single dataset."""
+
+    def _session(*args, **kwargs):
+        raise AssertionError("Session should only be used for multiple datasets")
+
+    monkeypatch.setattr(cli, "Session", _session)
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    result = runner.invoke(
+        stac, [src_path, "--config", "GDAL_DISABLE_READDIR_ON_OPEN=EMPTY_DIR"]
+    )
+    assert not result.exception
+    assert result.exit_code == 0
+
+
+def test_rio_stac_cli_help(runner):
+    """Should list the sub-commands."""
+    result = runner.invoke(stac, ["--help"])
+    assert result.exit_code == 0
+    assert "collection" in result.output
+    assert "item" in result.output
+
+    result = runner.invoke(stac, [])
+    assert "collection" in result.output
+
+    result = runner.invoke(stac, ["item", "--help"])
+    assert result.exit_code == 0
+    assert "INPUT" in result.output
+
+
+def test_rio_stac_cli_collection(runner):
+    """Should create a collection from newline-delimited items."""
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            stac, [os.path.join(PREFIX, "dataset_g*.tif"), "-o", "items.ndjson"]
+        )
+        assert not result.exception
+
+        result = runner.invoke(
+            stac,
+            ["collection", "items.ndjson", "--id", "my-collection", "--title", "Test"],
+        )
+        assert not result.exception
+        assert result.exit_code == 0
+        collection = json.loads(result.output)
+        assert collection["type"] == "Collection"
+        assert collection["id"] == "my-collection"
+        assert collection["title"] == "Test"
+        assert "raster:bands" in collection["summaries"]
+
+        with open("items.ndjson") as f:
+            result_stdin = runner.invoke(
+                stac,
+                ["collection", "--id", "my-collection", "--title", "Test"],
+                input=f.read(),
+            )
+        assert result_stdin.output == result.output
+
+        result = runner.invoke(stac, ["collection", "--id", "empty"], input="")
+        assert result.exit_code == 2
+
+        # `item` sub-command
+        result = runner.invoke(stac, ["item", os.path.join(PREFIX, "dataset_cog.tif")])
+        assert not result.exception
+        assert json.loads(result.output)["type"] == "Feature"
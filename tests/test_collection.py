@@ -0,0 +1,157 @@
+"""test collection."""
+
+import datetime
+import glob
+import os
+
+import numpy
+import pystac
+import pytest
+
+from rio_stac import create_stac_item, create_stac_items
+from rio_stac.collection import CollectionAggregator
+
+PREFIX = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_collection_aggregator():
+    """Should merge the items extent and summaries."""
+    paths = sorted(glob.glob(os.path.join(PREFIX, "dataset_g*.tif")))
+    input_datetime = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+    aggregator = CollectionAggregator()
+    items = list(
+        aggregator.consume(
+            create_stac_items(
+                paths,
+                executor="thread",
+                max_workers=2,
+                input_datetime=input_datetime,
+                with_proj=True,
+                with_raster=True,
+                as_dict=True,
+            )
+        )
+    )
+    assert len(items) == len(paths)
+    assert aggregator.count == len(paths)
+
+    assert aggregator.bbox == [
+        min(item["bbox"][0] for item in items),
+        min(item["bbox"][1] for item in items),
+        max(item["bbox"][2] for item in items),
+        max(item["bbox"][3] for item in items),
+    ]
+    assert aggregator.start_datetime == input_datetime
+    assert aggregator.end_datetime == input_datetime
+
+    summaries = aggregator.summaries()
+    assert summaries["proj:epsg"] == sorted(
+        {
+            item["properties"]["proj:epsg"]
+            for item in items
+            if item["properties"]["proj:epsg"] is not None
+        }
+    )
+    assert summaries["raster:bands"][0]["data_type"] == sorted(
+        {item["assets"]["asset"]["raster:bands"][0]["data_type"] for item in items}
+    )
+    stats = [item["assets"]["asset"]["raster:bands"][0]["statistics"] for item in items]
+    summary = summaries["raster:bands"][0]["statistics"]
+    assert summary["minimum"] == min(s["minimum"] for s in stats)
+    assert summary["maximum"] == max(s["maximum"] for s in stats)
+
+    # mean weighted by the number of valid pixels
+    counts = [
+        s["valid_percent"] / 100 * numpy.prod(item["properties"]["proj:shape"])
+        for s, item in zip(stats, items)
+    ]
+    assert summary["mean"] == pytest.approx(
+        sum(s["mean"] * c for s, c in zip(stats, counts)) / sum(counts), rel=1e-6
+    )
+
+    collection = aggregator.to_collection("my-collection", title="My Collection")
+    assert isinstance(collection, pystac.Collection)
+    assert collection.id == "my-collection"
+    assert collection.description == "my-collection"
+    assert collection.extent.spatial.bboxes == [aggregator.bbox]
+    assert collection.summaries.to_dict() == summaries
+    assert collection.validate()
+
+
+def test_collection_aggregator_merge():
+    """Should merge aggregators and pystac Items."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    item_a = create_stac_item(
+        src_path,
+        input_datetime=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        with_raster=True,
+    )
+    item_b = create_stac_item(
+        os.path.join(PREFIX, "dataset_geom.tif"),
+        properties={
+            "start_datetime": "2019-01-01T00:00:00Z",
+            "end_datetime": "2021-01-01T00:00:00Z",
+        },
+        with_raster=True,
+    )
+
+    aggregator = CollectionAggregator()
+    aggregator.add(item_a)
+    aggregator.add(item_b)
+
+    first = CollectionAggregator()
+    first.add(item_a)
+    second = CollectionAggregator()
+    second.add(item_b)
+    merged = CollectionAggregator()
+    merged.merge(first)
+    merged.merge(CollectionAggregator())
+    merged.merge(second)
+
+    assert merged.count == 2
+    assert merged.bbox == aggregator.bbox
+    assert merged.summaries() == aggregator.summaries()
+    assert aggregator.summaries()["raster:bands"][0]["data_type"] == [
+        "uint16",
+        "uint8",
+    ]
+    assert merged.start_datetime == datetime.datetime(
+        2019, 1, 1, tzinfo=datetime.timezone.utc
+    )
+    assert merged.end_datetime == datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc
+    )
+
+    with pytest.raises(ValueError):
+        CollectionAggregator().to_collection("empty")
+
+
+def test_collection_aggregator_antimeridian():
+    """Should merge bboxes crossing the antimeridian."""
+    items = [
+        {"bbox": [170.0, 0.0, -170.0, 1.0]},
+        {"bbox": [160.0, -1.0, 175.0, 0.5]},
+        {"bbox": [-175.0, 0.0, -160.0, 2.0]},
+    ]
+    aggregator = CollectionAggregator()
+    for item in items:
+        aggregator.add(item)
+    assert aggregator.bbox == [160.0, -1.0, -160.0, 2.0]
+
+    first = CollectionAggregator()
+    first.add(items[0])
+    second = CollectionAggregator()
+    second.add(items[1])
+    second.add(items[2])
+    first.merge(second)
+    assert first.bbox == aggregator.bbox
+
+    # Bboxes on both sides of the antimeridian
+    aggregator = CollectionAggregator()
+    aggregator.add({"bbox": [175.0, 0.0, 179.0, 1.0]})
+    aggregator.add({"bbox": [-179.0, 0.0, -175.0, 1.0]})
+    assert aggregator.bbox == [175.0, 0.0, -175.0, 1.0]
+
+    aggregator.add({"bbox": [0.0, 0.0, 10.0, 1.0]})
+    assert aggregator.bbox == [0.0, 0.0, -175.0, 1.0]
@@ -5,13 +5,28 @@ import json
 import os
 import sys
 import warnings
+from typing import Dict
 
 import numpy
 import pystac
 import pytest
 import rasterio
-
-from rio_stac.stac import create_stac_item, get_raster_info
+from rasterio import warp
+from rasterio.features import bounds as feature_bounds
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
+
+from rio_stac import stac
+from rio_stac.stac import (
+    _get_crs_info,
+    bbox_to_geom,
+    create_stac_item,
+    create_stac_item_from_assets,
+    get_dataset_geom,
+    get_dataset_geoms,
+    get_projection_info,
+    get_raster_info,
+)
 
 from .conftest import requires_hdf4, requires_hdf5
 
@@ -336,6 +351,212 @@ def test_densify_geom():
     assert item_dict["bbox"] != item_dens_dict["bbox"]
 
 
+def _reference_geom(src_dst, densify_pts: int, precision: int) -> Dict:
+    """Densify the bounds polygon and reproject it with `rasterio.warp.transform_geom`."""
+    coordinates = numpy.asarray(bbox_to_geom(src_dst.bounds)["coordinates"][0])
+    existing = numpy.arange(0, len(coordinates) * densify_pts, densify_pts)
+    interp = numpy.arange(existing[-1] + 1)
+    geom = {
+        "type": "Polygon",
+        "coordinates": [
+            list(
+                zip(
+                    numpy.interp(interp, existing, coordinates[:, 0]),
+                    numpy.interp(interp, existing, coordinates[:, 1]),
+                )
+            )
+        ],
+    }
+    geom = warp.transform_geom(src_dst.crs, "epsg:4326", geom, precision=precision)
+    return {"bbox": list(feature_bounds(geom)), "footprint": geom}
+
+
+def _assert_geom_equal(geom, expected):
+    """Compare footprints and bbox coordinates."""
+    assert geom["footprint"]["type"] == expected["footprint"]["type"]
+    assert geom["bbox"] == pytest.approx(expected["bbox"])
+
+    def _points(geom):
+        polygons = geom["coordinates"]
+        if geom["type"] == "Polygon":
+            polygons = [polygons]
+        return [point for polygon in polygons for ring in polygon for point in ring]
+
+    assert numpy.allclose(
+        _points(geom["footprint"]), _points(expected["footprint"]), atol=1e-6
+    )
+
+
+def test_dataset_geoms():
+    """Footprints for many datasets should match the reprojected densified bounds."""
+    srcs = [
+        os.path.join(PREFIX, name)
+        for name in [
+            "dataset_geom.tif",
+            "dataset_dateline.tif",
+            "dataset_cog.tif",
+            "dataset_geom.tif",
+        ]
+    ]
+
+    bounds = []
+    crs = []
+    expected = []
+    for src_path in srcs:
+        with rasterio.open(src_path) as src_dst:
+            bounds.append(src_dst.bounds)
+            crs.append(src_dst.crs)
+            expected.append(_reference_geom(src_dst, densify_pts=5, precision=6))
+
+    geoms = get_dataset_geoms(bounds, crs, densify_pts=5, precision=6)
+    for geom, ref in zip(geoms, expected):
+        _assert_geom_equal(geom, ref)
+    assert geoms[1]["footprint"]["type"] == "MultiPolygon"
+
+    # Same CRS for all the datasets
+    geoms = get_dataset_geoms(bounds[:1] * 3, crs[0])
+    assert len(geoms) == 3
+    assert geoms[0] == geoms[2]
+
+    with pytest.warns(UserWarning):
+        geoms = get_dataset_geoms([bounds[0], bounds[1]], [None, crs[1]])
+    assert geoms[0]["bbox"] == [-180.0, -90.0, 180.0, 90.0]
+
+    with pytest.raises(ValueError):
+        get_dataset_geoms(bounds, crs[:2])
+
+    with pytest.raises(ValueError):
+        get_dataset_geoms(bounds, crs, densify_pts=-1)
+
+
+def test_dataset_geom_from_mask():
+    """Geometry should be created from the valid pixels outline."""
+    src_path = os.path.join(PREFIX, "dataset_nodata_and_nan.tif")
+    with rasterio.open(src_path) as src_dst:
+        bounds = get_dataset_geom(src_dst)
+        geom = get_dataset_geom(src_dst, from_mask=True, max_vertices=32)
+
+    assert geom["footprint"]["type"] == "Polygon"
+    assert len(geom["footprint"]["coordinates"][0]) <= 32
+    assert geom["bbox"] != bounds["bbox"]
+    assert geom["bbox"][0] >= bounds["bbox"][0]
+    assert geom["bbox"][1] >= bounds["bbox"][1]
+    assert geom["bbox"][2] <= bounds["bbox"][2]
+    assert geom["bbox"][3] <= bounds["bbox"][3]
+
+    # Dataset without nodata
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with rasterio.open(src_path) as src_dst:
+        bounds = get_dataset_geom(src_dst)
+        geom = get_dataset_geom(src_dst, from_mask=True)
+
+    assert len(geom["footprint"]["coordinates"][0]) == 5
+    assert geom["bbox"] == pytest.approx(bounds["bbox"])
+
+    # Polygon crossing the antimeridian
+    src_path = os.path.join(PREFIX, "dataset_dateline.tif")
+    with rasterio.open(src_path) as src_dst:
+        geom = get_dataset_geom(src_dst, from_mask=True)
+    assert geom["footprint"]["type"] == "MultiPolygon"
+
+    with pytest.raises(ValueError):
+        with rasterio.open(src_path) as src_dst:
+            get_dataset_geom(src_dst, from_mask=True, max_vertices=3)
+
+    src_path = os.path.join(PREFIX, "dataset_nodata_nan.tif")
+    item = create_stac_item(src_path, geom_from_mask=True, geom_max_vertices=16)
+    assert item.validate()
+    assert len(item.geometry["coordinates"][0]) <= 16
+
+
+def test_create_item_timings():
+    """Should add the phases duration in the item properties."""
+    src_path = os.path.join(PREFIX, "dataset_gcps.tif")
+    item = create_stac_item(src_path, with_proj=True, with_raster=True, with_eo=True)
+    assert "rio_stac:timings" not in item.properties
+
+    item = create_stac_item(
+        src_path, with_proj=True, with_raster=True, with_eo=True, timings=True
+    )
+    assert item.validate()
+    timings = item.properties["rio_stac:timings"]
+    assert list(timings) == [
+        "open",
+        "warped_vrt",
+        "geometry",
+        "projection",
+        "raster_read",
+        "raster_stats",
+        "eo",
+        "item",
+        "total",
+    ]
+    assert all(value >= 0 for value in timings.values())
+    assert timings["total"] >= sum(v for k, v in timings.items() if k != "total")
+
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    item = create_stac_item(
+        src_path, with_raster=True, raster_stats_method="blockwise", timings=True
+    )
+    timings = item.properties["rio_stac:timings"]
+    assert "warped_vrt" not in timings
+    assert timings["raster_read"] > 0
+    assert timings["raster_stats"] > 0
+
+
+def test_create_item_lazy(monkeypatch):
+    """Should compute the raster:bands on first access."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    input_datetime = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    options = {
+        "input_datetime": input_datetime,
+        "with_proj": True,
+        "with_raster": True,
+        "with_eo": True,
+    }
+    item = create_stac_item(src_path, **options)
+
+    lazy_item = create_stac_item(src_path, lazy=True, timings=True, **options)
+    timings = lazy_item.properties.pop("rio_stac:timings")
+    assert "raster_read" not in timings
+    assert lazy_item.bbox == item.bbox
+    assert lazy_item.geometry == item.geometry
+    assert lazy_item.stac_extensions == item.stac_extensions
+    assert lazy_item.properties == item.properties
+
+    fields = lazy_item.assets["asset"].extra_fields
+    assert "raster:bands" in fields
+    assert "pending" in repr(fields)
+    assert lazy_item.to_dict() == item.to_dict()
+    assert "pending=[]" in repr(fields)
+    assert lazy_item.validate()
+
+    # Overwritten fields are not computed
+    lazy_item = create_stac_item(src_path, lazy=True, **options)
+    lazy_item.assets["asset"].extra_fields["raster:bands"] = []
+    assert lazy_item.to_dict()["assets"]["asset"]["raster:bands"] == []
+
+    # Only the raster:bands are computed
+    lazy_item = create_stac_item(
+        src_path, lazy=True, geom_from_mask=True, raster_percentiles=[2], **options
+    )
+    calls = []
+    for name in ["_get_mask_rings", "get_projection_info", "get_eobands_info"]:
+        monkeypatch.setattr(
+            stac, name, lambda *args, name=name, **kwargs: calls.append(name)
+        )
+
+    bands = lazy_item.assets["asset"].extra_fields["raster:bands"]
+    assert not calls
+    assert "percentile_2" in bands[0]["statistics"]
+    monkeypatch.undo()
+
+    # Opened datasets are not lazy
+    with rasterio.open(src_path) as src_dst:
+        lazy_item = create_stac_item(src_dst, lazy=True, **options)
+    assert isinstance(lazy_item.assets["asset"].extra_fields, dict)
+
+
 def test_mars_dataset():
     """Test with Mars Dataset."""
     MARS2000_SPHERE = rasterio.crs.CRS.from_proj4("+proj=longlat +R=3396190 +no_defs")
@@ -352,6 +573,23 @@ def test_mars_dataset():
     )
 
 
+def test_projection_info_cache():
+    """CRS information should be cached between datasets."""
+    _get_crs_info.cache_clear()
+
+    src_path = os.path.join(PREFIX, "dataset_mars.tif")
+    with rasterio.open(src_path) as src_dst:
+        proj = get_projection_info(src_dst)
+
+    with rasterio.open(src_path) as src_dst:
+        assert get_projection_info(src_dst) == proj
+        assert get_projection_info(src_dst) == proj
+
+    info = _get_crs_info.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
 def test_json_serialization():
     """Test JSON serialization"""
     src_path = os.path.join(PREFIX, "dataset_cog.tif")
@@ -423,3 +661,484 @@ def test_stats_with_nan_missing_nodata():
         info = get_raster_info(src)
         assert info[0]["statistics"]["minimum"] > 0
         assert info[0]["statistics"]["maximum"] > 0
+
+
+def test_raster_info_multibands():
+    """Stats from the single multi-bands read should match per-band reads."""
+    src_path = os.path.join(PREFIX, "dataset_mars.tif")
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(src, max_size=128)
+        assert len(info) == 3
+
+        height, width = 128, 86
+        for band, meta in zip(src.indexes, info):
+            arr = src.read(indexes=band, out_shape=(height, width), masked=True)
+            assert meta["statistics"]["minimum"] == arr.min().item()
+            assert meta["statistics"]["maximum"] == arr.max().item()
+            assert meta["statistics"]["mean"] == pytest.approx(arr.mean().item())
+
+
+@pytest.mark.parametrize(
+    "file",
+    [
+        "dataset_cog.tif",
+        "dataset_geo.tif",
+        "dataset_mars.tif",
+        "dataset_int16_nodata.tif",
+        "dataset_nodata_and_nan.tif",
+    ],
+)
+def test_raster_info_blockwise(file):
+    """Blockwise statistics should match full resolution statistics."""
+    src_path = os.path.join(PREFIX, file)
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(src, max_size=0)
+        info_block = get_raster_info(src, stats_method="blockwise")
+
+    for meta, meta_block in zip(info, info_block):
+        for key in ["mean", "minimum", "maximum", "stddev"]:
+            assert meta_block["statistics"][key] == pytest.approx(meta["statistics"][key])
+        assert meta_block["histogram"] == meta["histogram"]
+
+
+@pytest.mark.parametrize(
+    "file",
+    ["dataset_cog.tif", "dataset_nodata_and_nan.tif", "dataset_int16_nodata.tif"],
+)
+def test_raster_info_blockwise_threads(file):
+    """Blockwise statistics calculated with multiple threads should match."""
+    src_path = os.path.join(PREFIX, file)
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(src, stats_method="blockwise")
+        timings = {}
+        info_threads = get_raster_info(
+            src, stats_method="blockwise", num_threads=3, timings=timings
+        )
+        assert timings["raster_read"] > 0
+        assert timings["raster_stats"] > 0
+
+        # Datasets which cannot be re-opened are read in the current thread
+        with WarpedVRT(src) as vrt:
+            info_vrt = get_raster_info(vrt, stats_method="blockwise", num_threads=3)
+
+    for meta, meta_threads, meta_vrt in zip(info, info_threads, info_vrt):
+        for key in ["mean", "minimum", "maximum", "stddev", "valid_percent"]:
+            assert meta_threads["statistics"][key] == pytest.approx(
+                meta["statistics"][key]
+            )
+            assert meta_vrt["statistics"][key] == pytest.approx(meta["statistics"][key])
+        assert meta_threads["histogram"] == meta["histogram"]
+
+
+def test_raster_info_blockwise_options():
+    """Check blockwise statistics options."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(
+            src, stats_method="blockwise", histogram_bins=5, histogram_range=(0, 10)
+        )
+        assert info[0]["histogram"]["count"] == 6
+        assert info[0]["histogram"]["min"] == 0
+        assert info[0]["histogram"]["max"] == 10
+        assert info[0]["statistics"]["valid_percent"] == 100.0
+
+        info = get_raster_info(src, stats_method="blockwise", histogram_bins=[0, 10, 100])
+        assert info[0]["histogram"]["count"] == 3
+
+        with pytest.raises(ValueError):
+            get_raster_info(src, stats_method="blockwise", histogram_bins="auto")
+
+        with pytest.raises(ValueError):
+            get_raster_info(src, stats_method="somethingelse")
+
+    item = create_stac_item(
+        src_path,
+        input_datetime=input_date,
+        with_raster=True,
+        raster_stats_method="blockwise",
+    )
+    assert item.validate()
+    assert item.to_dict()["assets"]["asset"]["raster:bands"][0]["statistics"]
+
+
+def test_raster_info_sample():
+    """Sample statistics should be bounded by the sample size."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with rasterio.open(src_path) as src:
+        # 2667x2658 with 256x256 blocks -> 121 blocks
+        exact = get_raster_info(src, stats_method="blockwise")[0]
+        info = get_raster_info(src, stats_method="sample", sample_size=4 * 256 * 256)
+        assert info == get_raster_info(
+            src, stats_method="sample", sample_size=4 * 256 * 256
+        )
+
+        sample = info[0]["statistics_sample"]
+        assert sample["blocks"] == 4
+        assert sample["total_blocks"] == 121
+        low, high = sample["mean_confidence_interval"]
+        assert low <= info[0]["statistics"]["mean"] <= high
+        assert sum(info[0]["histogram"]["buckets"]) <= 4 * 256 * 256
+
+        # At least one block is read
+        info = get_raster_info(src, stats_method="sample", sample_size=1)
+        assert info[0]["statistics_sample"]["blocks"] == 1
+        assert "mean_confidence_interval" not in info[0]["statistics_sample"]
+
+        # All the blocks: exact statistics
+        info = get_raster_info(src, stats_method="sample", sample_size=121 * 256 * 256)
+        assert info[0]["statistics_sample"]["blocks"] == 121
+        for key in ["mean", "minimum", "maximum", "stddev"]:
+            assert info[0]["statistics"][key] == pytest.approx(exact["statistics"][key])
+        low, high = info[0]["statistics_sample"]["mean_confidence_interval"]
+        assert low == pytest.approx(exact["statistics"]["mean"])
+        assert high == pytest.approx(exact["statistics"]["mean"])
+
+    item = create_stac_item(
+        src_path,
+        input_datetime=input_date,
+        with_raster=True,
+        raster_stats_method="sample",
+        raster_sample_size=2 * 256 * 256,
+    )
+    assert item.validate()
+    band = item.to_dict()["assets"]["asset"]["raster:bands"][0]
+    assert band["statistics_sample"]["blocks"] == 2
+
+
+@pytest.mark.parametrize(
+    "file", ["dataset_cog.tif", "dataset_int16_nodata.tif", "dataset_nodata_and_nan.tif"]
+)
+def test_raster_info_percentiles(file):
+    """Should add the percentiles to the statistics."""
+    src_path = os.path.join(PREFIX, file)
+    with rasterio.open(src_path) as src:
+        arr = src.read(1, masked=True)
+        valid = arr.compressed()
+        valid = valid[numpy.isfinite(valid)]
+        expected = numpy.percentile(valid, [2, 50, 98])
+        integer = src.dtypes[0] in ["uint16", "int16"]
+
+        info = get_raster_info(src, max_size=0, percentiles=[2, 50, 98])
+        stats = info[0]["statistics"]
+        for name, value in zip(["2", "50", "98"], expected):
+            assert stats[f"percentile_{name}"] == pytest.approx(value)
+
+        info = get_raster_info(
+            src, stats_method="blockwise", percentiles=[2, 50, 98], num_threads=2
+        )
+        stats = info[0]["statistics"]
+        # exact for integer data, otherwise within one bin of the fine histogram
+        tolerance = 0 if integer else (stats["maximum"] - stats["minimum"]) / 4096
+        for name, value in zip(["2", "50", "98"], expected):
+            assert stats[f"percentile_{name}"] == pytest.approx(value, abs=tolerance)
+
+        info = get_raster_info(src, percentiles=[99.5])
+        assert "percentile_99.5" in info[0]["statistics"]
+
+        info = get_raster_info(src)
+        assert not any(name.startswith("percentile") for name in info[0]["statistics"])
+
+        for stats_method in ["decimated", "blockwise", "sample"]:
+            for percentiles in [[150], [-1], [2, float("nan")]]:
+                with pytest.raises(ValueError, match="between 0 and 100"):
+                    get_raster_info(
+                        src, stats_method=stats_method, percentiles=percentiles
+                    )
+
+        for stats_method in ["metadata", "gdal-approx", "gdal-exact"]:
+            with pytest.raises(ValueError, match="not supported"):
+                get_raster_info(src, stats_method=stats_method, percentiles=[2])
+
+            with pytest.raises(ValueError, match="not supported"):
+                get_raster_info(src, stats_method=stats_method, histogram_bins=5)
+
+            with pytest.raises(ValueError, match="not supported"):
+                get_raster_info(src, stats_method=stats_method, histogram_range=(0, 10))
+
+    item = create_stac_item(
+        src_path,
+        input_datetime=input_date,
+        with_raster=True,
+        raster_percentiles=[2, 98],
+    )
+    assert item.validate()
+    stats = item.to_dict()["assets"]["asset"]["raster:bands"][0]["statistics"]
+    assert "percentile_2" in stats
+    assert "percentile_98" in stats
+
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        create_stac_item(
+            src_path,
+            input_datetime=input_date,
+            with_raster=True,
+            raster_percentiles=[101],
+        )
+
+
+@pytest.mark.parametrize(
+    "file,passes",
+    [
+        ("dataset_cog.tif", 1),
+        ("dataset_int16_nodata.tif", 1),
+        ("dataset_nodata_and_nan.tif", 2),
+    ],
+)
+def test_raster_info_blockwise_passes(monkeypatch, file, passes):
+    """Should read 8 and 16 bits integer data once."""
+    calls = []
+    accumulate_windows = stac._accumulate_windows
+
+    def _accumulate_windows(*args, **kwargs):
+        calls.append(args)
+        return accumulate_windows(*args, **kwargs)
+
+    monkeypatch.setattr(stac, "_accumulate_windows", _accumulate_windows)
+
+    with rasterio.open(os.path.join(PREFIX, file)) as src:
+        info = get_raster_info(src, stats_method="blockwise", percentiles=[2, 98])
+        assert len(calls) == passes
+
+        monkeypatch.undo()
+        exact = get_raster_info(src, max_size=0)
+
+    for band, expected in zip(info, exact):
+        assert band["histogram"] == expected["histogram"]
+        for name in ["minimum", "maximum", "mean"]:
+            assert band["statistics"][name] == pytest.approx(expected["statistics"][name])
+
+
+def test_raster_info_overview():
+    """Should use the dataset overviews."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with rasterio.open(src_path) as src:
+        # overviews: [2, 4, 8, 16], 2667x2658 -> 667x665 for level 1
+        info = get_raster_info(src, max_size=1024)
+        assert info[0]["overview_level"] == 1
+
+        with rasterio.open(src_path, OVERVIEW_LEVEL=1) as ovr:
+            arr = ovr.read(1, masked=True)
+        assert info[0]["statistics"]["mean"] == pytest.approx(arr.mean().item())
+
+        # no overview small enough
+        info = get_raster_info(src, max_size=128)
+        assert "overview_level" not in info[0]
+
+        # full resolution
+        info = get_raster_info(src, max_size=0)
+        assert "overview_level" not in info[0]
+
+    src_path = os.path.join(PREFIX, "dataset.tif")
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(src, max_size=1024)
+        assert "overview_level" not in info[0]
+
+
+def test_get_stats():
+    """Check statistics calculation."""
+    from rio_stac.stac import _get_stats
+
+    arr = numpy.ma.MaskedArray(numpy.arange(1, 11, dtype="float32").reshape(2, 5))
+    stats = _get_stats(arr)["statistics"]
+    assert stats["valid_percent"] == 100.0
+    assert stats["minimum"] == 1
+    assert stats["maximum"] == 10
+    assert stats["mean"] == 5.5
+
+    arr.data[0, 0] = numpy.nan
+    arr.data[0, 1] = numpy.inf
+    arr[1, 4] = numpy.ma.masked
+    stats = _get_stats(arr)["statistics"]
+    assert stats["valid_percent"] == 70.0
+    assert stats["minimum"] == 3
+    assert stats["maximum"] == 9
+    assert stats["mean"] == 6.0
+    assert stats["stddev"] == pytest.approx(numpy.std([3, 4, 5, 6, 7, 8, 9]))
+
+    arr = numpy.ma.MaskedArray(numpy.zeros((2, 2), dtype="uint8"), mask=True)
+    stats = _get_stats(arr)
+    assert stats["statistics"]["valid_percent"] == 0.0
+    assert stats["histogram"]["buckets"] == [0] * 10
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "int8", "uint16", "int16"])
+@pytest.mark.parametrize(
+    "bins,range", [(10, None), (5, (0, 50)), ([-100, 0, 5, 100], None)]
+)
+def test_get_stats_integer(dtype, bins, range):
+    """Integer statistics (from counts) should match the generic implementation."""
+    from rio_stac.stac import _get_stats
+
+    rng = numpy.random.default_rng(0)
+    info = numpy.iinfo(dtype)
+    data = rng.integers(info.min, info.max, size=(100, 100), endpoint=True)
+    mask = rng.random((100, 100)) < 0.2
+    arr = numpy.ma.MaskedArray(data.astype(dtype), mask=mask)
+    arr_float = numpy.ma.MaskedArray(data.astype("float64"), mask=mask)
+
+    stats = _get_stats(arr, bins=bins, range=range)
+    stats_float = _get_stats(arr_float, bins=bins, range=range)
+    assert stats["histogram"] == stats_float["histogram"]
+    for key, value in stats_float["statistics"].items():
+        assert stats["statistics"][key] == pytest.approx(value)
+
+
+def test_raster_info_metadata(tmp_path):
+    """Should only use the statistics from the dataset metadata."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(src, stats_method="metadata")
+        assert info[0]["data_type"] == "uint16"
+        assert "statistics" not in info[0]
+        assert "histogram" not in info[0]
+
+        profile = src.profile
+        data = src.read()
+
+    dst_path = str(tmp_path / "dataset_stats.tif")
+    with rasterio.open(dst_path, "w", **profile) as dst:
+        dst.write(data)
+        dst.update_tags(
+            1,
+            STATISTICS_MINIMUM="1",
+            STATISTICS_MAXIMUM="7872",
+            STATISTICS_MEAN="2106.5",
+            STATISTICS_STDDEV="2270.2",
+        )
+
+    with rasterio.open(dst_path) as src:
+        info = get_raster_info(src, stats_method="metadata")
+        assert info[0]["statistics"] == {
+            "mean": 2106.5,
+            "minimum": 1.0,
+            "maximum": 7872.0,
+            "stddev": 2270.2,
+        }
+        assert "histogram" not in info[0]
+
+    item = create_stac_item(dst_path, with_raster=True, raster_stats_method="metadata")
+    assert item.validate()
+    assert item.to_dict()["assets"]["asset"]["raster:bands"][0]["statistics"]
+
+
+@pytest.mark.parametrize("stats_method", ["gdal-approx", "gdal-exact"])
+def test_raster_info_gdal(tmp_path, stats_method):
+    """Should use GDAL statistics."""
+    src_path = str(tmp_path / "dataset_cog.tif")
+    with open(os.path.join(PREFIX, "dataset_cog.tif"), "rb") as fin:
+        with open(src_path, "wb") as fout:
+            fout.write(fin.read())
+
+    with rasterio.open(src_path) as src:
+        info = get_raster_info(src, stats_method=stats_method)
+        exact = get_raster_info(src, stats_method="blockwise")
+
+    # The statistics are not saved next to the dataset
+    assert os.listdir(tmp_path) == ["dataset_cog.tif"]
+
+    stats = info[0]["statistics"]
+    assert "histogram" not in info[0]
+    assert stats["minimum"] == 1
+    assert stats["maximum"] == 7872
+    if stats_method == "gdal-exact":
+        assert stats["mean"] == pytest.approx(exact[0]["statistics"]["mean"])
+        assert stats["stddev"] == pytest.approx(exact[0]["statistics"]["stddev"])
+    else:
+        assert stats["mean"] == pytest.approx(exact[0]["statistics"]["mean"], rel=0.01)
+
+
+def test_create_item_from_assets_antimeridian(tmp_path):
+    """Should merge assets footprints crossing the antimeridian."""
+    src_path = os.path.join(PREFIX, "dataset_dateline.tif")
+    subset_path = str(tmp_path / "subset.tif")
+    with rasterio.open(src_path) as src_dst:
+        window = Window(0, 0, 1000, 1000)
+        profile = {
+            **src_dst.profile,
+            "width": window.width,
+            "height": window.height,
+            "transform": src_dst.window_transform(window),
+        }
+        with rasterio.open(subset_path, "w", **profile) as dst:
+            dst.write(src_dst.read(window=window))
+
+    item = create_stac_item_from_assets(
+        {"full": src_path, "subset": subset_path},
+        id="dateline",
+        input_datetime=input_date,
+    )
+    assert item.validate()
+    minx, miny, maxx, maxy = item.bbox
+    # crossing the antimeridian
+    assert minx > maxx
+    assert minx == pytest.approx(177.99857, abs=1e-4)
+    assert maxx == pytest.approx(-178.51382, abs=1e-4)
+    assert miny == pytest.approx(50.58185, abs=1e-4)
+    assert maxy == pytest.approx(52.77374, abs=1e-4)
+    assert item.geometry["type"] == "MultiPolygon"
+    east, west = (
+        feature_bounds({"type": "Polygon", "coordinates": polygon})
+        for polygon in item.geometry["coordinates"]
+    )
+    assert east == (minx, miny, 180.0, maxy)
+    assert west == (-180.0, miny, maxx, maxy)
+
+
+def test_create_item_from_assets():
+    """Should create an item with multiple assets."""
+    prefix = os.path.join(
+        os.path.dirname(__file__), "..", "docs", "docs", "examples", "data"
+    )
+    bands = ["B01", "B02", "B03"]
+    assets = {band: os.path.join(prefix, f"{band}.tif") for band in bands}
+
+    item = create_stac_item_from_assets(
+        assets,
+        id="my_item",
+        input_datetime=input_date,
+        asset_roles={"B01": ["data"]},
+        with_proj=True,
+        with_raster=True,
+        with_eo=True,
+    )
+    assert item.validate()
+    item_dict = item.to_dict()
+    assert item_dict["id"] == "my_item"
+    assert list(item_dict["assets"]) == bands
+    assert item_dict["assets"]["B01"]["roles"] == ["data"]
+
+    # Same grid for all the assets: projection at item level
+    single = create_stac_item(assets["B01"], with_proj=True).to_dict()
+    assert item_dict["geometry"] == single["geometry"]
+    assert item_dict["properties"]["proj:epsg"] == single["properties"]["proj:epsg"]
+    assert item_dict["properties"]["proj:shape"] == single["properties"]["proj:shape"]
+    for asset in item_dict["assets"].values():
+        assert not any(key.startswith("proj:") for key in asset)
+        assert asset["raster:bands"]
+        assert asset["eo:bands"]
+
+    # Different grids
+    assets = {
+        "cog": os.path.join(PREFIX, "dataset_cog.tif"),
+        "geom": os.path.join(PREFIX, "dataset_geom.tif"),
+    }
+    item = create_stac_item_from_assets(
+        assets, id="my_item", input_datetime=input_date, with_proj=True
+    )
+    assert item.validate()
+    item_dict = item.to_dict()
+
+    bboxes = [
+        create_stac_item(href, input_datetime=input_date).bbox for href in assets.values()
+    ]
+    assert item_dict["bbox"] == [
+        min(b[0] for b in bboxes),
+        min(b[1] for b in bboxes),
+        max(b[2] for b in bboxes),
+        max(b[3] for b in bboxes),
+    ]
+    assert "proj:shape" not in item_dict["properties"]
+    assert item_dict["assets"]["cog"]["proj:shape"]
+    assert item_dict["assets"]["geom"]["proj:shape"]
+
+    with pytest.raises(ValueError):
+        create_stac_item_from_assets({}, id="my_item")
@@ -0,0 +1,69 @@
+"""test JSON serialization."""
+
+import datetime
+import json
+import os
+
+import numpy
+import pytest
+
+from rio_stac import (
+    create_stac_item,
+    create_stac_item_dict,
+    create_stac_items,
+    serialization,
+)
+
+PREFIX = os.path.join(os.path.dirname(__file__), "fixtures")
+input_date = datetime.datetime.now(datetime.timezone.utc)
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_dumps(backend, monkeypatch):
+    """Should serialize numpy and datetime values."""
+    if backend == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    obj = {
+        "int": numpy.int16(-2),
+        "float": numpy.float64(1.5),
+        "array": numpy.arange(3, dtype="uint8"),
+        "datetime": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        "list": [1, "a", None],
+    }
+    assert json.loads(serialization.dumps(obj)) == {
+        "int": -2,
+        "float": 1.5,
+        "array": [0, 1, 2],
+        "datetime": "2020-01-01T00:00:00Z",
+        "list": [1, "a", None],
+    }
+    assert " " not in serialization.dumps(obj)
+
+    with pytest.raises(TypeError):
+        serialization.dumps({"a": object()})
+
+
+def test_create_item_dict():
+    """Should create the same item without pystac objects."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    options = {
+        "input_datetime": input_date,
+        "collection": "mycollection",
+        "with_proj": True,
+        "with_raster": True,
+        "with_eo": True,
+    }
+
+    item_dict = create_stac_item_dict(src_path, **options)
+    item = create_stac_item(src_path, **options)
+    assert json.loads(serialization.dumps(item_dict)) == json.loads(
+        json.dumps(item.to_dict())
+    )
+
+    items = list(
+        create_stac_items([src_path], executor="thread", as_dict=True, **options)
+    )
+    assert items == [item_dict]
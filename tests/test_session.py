@@ -0,0 +1,138 @@
+"""test session."""
+
+import datetime
+import gc
+import json
+import os
+import pickle
+import threading
+
+import pytest
+from rasterio._env import get_gdal_config
+
+from rio_stac import create_stac_item, create_stac_items
+from rio_stac.session import Session
+
+PREFIX = os.path.join(os.path.dirname(__file__), "fixtures")
+input_date = datetime.datetime.now(datetime.timezone.utc)
+
+
+def test_session_pool():
+    """Should keep a limited number of opened datasets."""
+    paths = [
+        os.path.join(PREFIX, name)
+        for name in ["dataset_cog.tif", "dataset_geo.tif", "dataset_geom.tif"]
+    ]
+
+    with Session(config={"MY_OPTION": "YES"}, max_handles=2) as session:
+        assert get_gdal_config("MY_OPTION") == "YES"
+        assert get_gdal_config("VSI_CACHE")
+
+        with session.open(paths[0]) as src_dst:
+            first = src_dst
+
+        with session.open(paths[0]) as src_dst:
+            assert src_dst is first
+            assert not src_dst.closed
+
+        with session.open(paths[1]):
+            pass
+        assert len(session) == 2
+
+        # Least recently used dataset is closed
+        with session.open(paths[2]):
+            pass
+        assert len(session) == 2
+        assert first.closed
+
+        # Datasets in use are not closed
+        with session.open(paths[0]) as src0:
+            with session.open(paths[1]) as src1:
+                with session.open(paths[2]):
+                    assert not src0.closed
+                    assert not src1.closed
+
+        assert len(session) == 2
+
+    assert len(session) == 0
+    assert get_gdal_config("MY_OPTION") is None
+
+    # Without pool
+    session = Session()
+    with session.open(paths[0]) as src_dst:
+        pass
+    assert src_dst.closed
+    assert len(session) == 0
+
+
+def test_session_env(monkeypatch):
+    """Should re-use the GDAL environment and keep the user's environment variables."""
+    monkeypatch.setenv("GDAL_HTTP_MAX_RETRY", "10")
+    session = Session(config={"MY_OPTION": "YES"})
+    assert "GDAL_HTTP_MAX_RETRY" not in session.config
+    assert session.config["VSI_CACHE"] == "TRUE"
+
+    with session.env() as env:
+        assert get_gdal_config("MY_OPTION") == "YES"
+        with session.env() as nested:
+            assert nested is env
+        assert get_gdal_config("MY_OPTION") == "YES"
+
+    assert get_gdal_config("MY_OPTION") is None
+
+    with session.env() as other:
+        assert other is env
+        assert get_gdal_config("MY_OPTION") == "YES"
+
+
+def test_session_thread_pool():
+    """Should close the datasets opened in a thread when it exits."""
+    session = Session(max_handles=2)
+    datasets = []
+
+    def _open():
+        with session.open(os.path.join(PREFIX, "dataset_cog.tif")) as src_dst:
+            datasets.append(src_dst)
+
+    thread = threading.Thread(target=_open)
+    thread.start()
+    thread.join()
+    del thread
+    gc.collect()
+
+    assert datasets[0].closed
+    assert len(session) == 0
+
+
+def test_session_pickle():
+    """Should share the same session in a process."""
+    session = Session(config={"MY_OPTION": "YES"}, max_handles=2)
+    copy = pickle.loads(pickle.dumps(session))
+    assert copy is not session
+    assert copy.config == session.config
+    assert copy.max_handles == 2
+    assert pickle.loads(pickle.dumps(session)) is copy
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_create_items_session(executor):
+    """Should create the same items with a session."""
+    src_path = os.path.join(PREFIX, "dataset_cog.tif")
+    options = {"input_datetime": input_date, "with_raster": True, "with_eo": True}
+    item = create_stac_item(src_path, **options)
+
+    with Session(max_handles=4) as session:
+        item_session = create_stac_item(src_path, session=session, **options)
+        assert json.dumps(item_session.to_dict()) == json.dumps(item.to_dict())
+        assert len(session) == 1
+
+        items = list(
+            create_stac_items(
+                [src_path] * 4,
+                max_workers=2,
+                executor=executor,
+                session=session,
+                **options,
+            )
+        )
+        assert len(items) == 4
@@ -0,0 +1,149 @@
+"""test statistics accumulator."""
+
+import pickle
+
+import numpy
+import pytest
+
+from rio_stac import StatisticsAccumulator
+from rio_stac.statistics import get_sketch_edges
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "int16", "float32"])
+def test_accumulator(dtype):
+    """Merged statistics should match the statistics of the whole array."""
+    rng = numpy.random.default_rng(1)
+    data = rng.integers(-100 if dtype != "uint8" else 0, 200, (100, 100)).astype(dtype)
+    arr = numpy.ma.MaskedArray(data, mask=data == 10)
+
+    edges = numpy.linspace(-100, 200, 11)
+    whole = StatisticsAccumulator(edges=edges)
+    whole.update(arr)
+
+    parts = [StatisticsAccumulator(edges=edges) for _ in range(4)]
+    for part, rows in zip(parts, numpy.array_split(arr, 4)):
+        part.update(rows)
+
+    merged = StatisticsAccumulator(edges=edges)
+    for part in parts:
+        merged.merge(part)
+    merged.merge(StatisticsAccumulator())
+
+    valid = data[data != 10].astype("float64")
+    assert merged.count == whole.count == valid.size
+    assert merged.size == whole.size == data.size
+    assert merged.mean == pytest.approx(valid.mean())
+    assert merged.sum == pytest.approx(valid.sum())
+    assert merged.stddev == pytest.approx(valid.std())
+    assert merged.minimum == valid.min()
+    assert merged.maximum == valid.max()
+
+    stats = merged.finalize()
+    assert stats["histogram"] == whole.finalize()["histogram"]
+    assert stats["histogram"]["buckets"] == numpy.histogram(valid, bins=edges)[0].tolist()
+    assert stats["statistics"]["valid_percent"] == pytest.approx(
+        valid.size / data.size * 100
+    )
+
+    # Different histogram edges
+    merged.merge(parts[0])
+    assert "histogram" in merged.finalize()
+    other = StatisticsAccumulator(edges=[0, 1])
+    other.update(arr)
+    merged.merge(other)
+    assert "histogram" not in merged.finalize()
+
+
+def test_accumulator_empty():
+    """Should return zero statistics without valid values."""
+    acc = StatisticsAccumulator()
+    acc.update(numpy.ma.MaskedArray(numpy.zeros(4), mask=True))
+    acc.update(numpy.array([numpy.nan, numpy.inf]))
+    assert acc.count == 0
+    assert acc.size == 6
+    assert acc.finalize() == {
+        "statistics": {
+            "mean": 0.0,
+            "minimum": 0.0,
+            "maximum": 0.0,
+            "stddev": 0.0,
+            "valid_percent": 0.0,
+        }
+    }
+
+
+def test_accumulator_pickle():
+    """Should be picklable."""
+    acc = StatisticsAccumulator(edges=[0, 5, 10])
+    acc.update(numpy.arange(10, dtype="uint8"))
+    assert not hasattr(acc, "__dict__")
+
+    copy = pickle.loads(pickle.dumps(acc))
+    assert copy.finalize() == acc.finalize()
+
+
+def test_accumulator_from_statistics():
+    """Should create an accumulator from STAC statistics."""
+    data = numpy.arange(100, dtype="float64")
+    first = StatisticsAccumulator()
+    first.update(data[:30])
+
+    acc = StatisticsAccumulator.from_statistics(first.finalize()["statistics"], 30)
+    acc.update(data[30:])
+    assert acc.count == 100
+    assert acc.mean == pytest.approx(data.mean())
+    assert acc.stddev == pytest.approx(data.std())
+    assert acc.minimum == 0
+    assert acc.maximum == 99
+
+    acc = StatisticsAccumulator.from_statistics({"valid_percent": 0.0}, 10)
+    assert acc.count == 0
+    assert acc.size == 10
+
+
+@pytest.mark.parametrize("dtype", ["uint16", "int16", "float64"])
+def test_accumulator_percentiles(dtype):
+    """Should estimate the percentiles from the merged sketches."""
+    rng = numpy.random.default_rng(2)
+    data = rng.normal(1000, 200, 10_000).astype(dtype)
+    sketch_edges = get_sketch_edges(data.min(), data.max(), dtype)
+
+    parts = [StatisticsAccumulator(sketch_edges=sketch_edges) for _ in range(3)]
+    for part, values in zip(parts, numpy.array_split(data, 3)):
+        part.update(values)
+
+    acc = pickle.loads(pickle.dumps(parts[0]))
+    for part in parts[1:]:
+        acc.merge(part)
+
+    expected = numpy.percentile(data, [0, 2, 50, 98, 100])
+    values = acc.percentiles([0, 2, 50, 98, 100])
+    if dtype == "float64":
+        bin_width = (data.max() - data.min()) / 4096
+        assert values == pytest.approx(expected, abs=bin_width)
+    else:
+        assert values == pytest.approx(expected)
+
+    stats = acc.finalize(percentiles=[2, 98])["statistics"]
+    assert stats["percentile_2"] == values[1]
+    assert stats["percentile_98"] == values[3]
+
+    # No sketch
+    assert StatisticsAccumulator().percentiles([2]) is None
+    assert "percentile_2" not in StatisticsAccumulator().finalize([2])["statistics"]
+
+
+def test_accumulator_histogram_from_sketch():
+    """Should derive the histogram from the percentiles histogram."""
+    data = numpy.random.default_rng(3).integers(-500, 500, 10_000).astype("int16")
+    acc = StatisticsAccumulator(sketch_edges=get_sketch_edges(-32768, 32767, "int16"))
+    acc.update(data)
+
+    edges = numpy.histogram_bin_edges([acc.minimum, acc.maximum], bins=10)
+    acc.histogram_from_sketch(edges)
+    assert acc.histogram.tolist() == numpy.histogram(data, bins=edges)[0].tolist()
+    assert acc.finalize()["histogram"]["buckets"] == acc.histogram.tolist()
+
+    acc = StatisticsAccumulator()
+    acc.histogram_from_sketch([0, 1, 2])
+    assert acc.histogram.tolist() == [0, 0]